@@ -0,0 +1,86 @@
+import ipaddress
+import random
+import re
+import time
+from policy_object_txt_to_json import detect_type
+
+# --- Configuration ---
+LINE_COUNT = 1_000_000  # Synthetic feed size
+SEED = 42  # Fixed seed so runs are comparable
+
+def detect_type_original(value):
+    """
+    The original exception-driven detect_type, kept as the baseline.
+    """
+    value = value.strip()
+    
+    try:
+        ipaddress.ip_address(value)
+        return "ip"
+    except ValueError:
+        pass
+    
+    try:
+        ipaddress.ip_network(value, strict=False)
+        return "cidr"
+    except ValueError:
+        pass
+    
+    if re.match(r'^(\*\.)?([a-zA-Z0-9-]+\.)*[a-zA-Z0-9-]+\.[a-zA-Z]{2,}$', value):
+        return "fqdn"
+    
+    if '*' in value or '?' in value:
+        return "fqdn"
+    
+    return "fqdn"
+
+def generate_feed(count, seed):
+    """
+    Generate a mixed feed: IPv4, IPv4 CIDRs, IPv6, domains and wildcards.
+    """
+    rng = random.Random(seed)
+    words = ["login", "cdn", "mail", "secure", "update", "api", "static", "track"]
+    tlds = ["com", "net", "org", "io", "ru", "cn"]
+    lines = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.35:
+            lines.append(".".join(str(rng.randint(0, 255)) for _ in range(4)))
+        elif kind < 0.50:
+            lines.append(".".join(str(rng.randint(0, 255)) for _ in range(4)) + f"/{rng.randint(8, 32)}")
+        elif kind < 0.60:
+            lines.append(f"2001:db8:{rng.randint(0, 65535):x}::{rng.randint(0, 65535):x}")
+        elif kind < 0.90:
+            lines.append(f"{rng.choice(words)}{rng.randint(0, 9999)}.{rng.choice(words)}.{rng.choice(tlds)}")
+        else:
+            lines.append(f"*.{rng.choice(words)}{rng.randint(0, 9999)}.{rng.choice(tlds)}")
+    return lines
+
+def measure(label, func, lines):
+    """
+    Time a classifier over all lines and print lines/second.
+    """
+    start = time.perf_counter()
+    result = func(lines)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f}s  {len(lines) / elapsed:>12,.0f} lines/s")
+    return result, elapsed
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("detect_type Micro-benchmark")
+    print("=" * 70)
+    
+    print(f"\nGenerating {LINE_COUNT:,} synthetic feed lines...")
+    lines = generate_feed(LINE_COUNT, SEED)
+    
+    print("\nClassifying:")
+    before, before_time = measure("Original detect_type", lambda ls: [detect_type_original(v) for v in ls], lines)
+    after, after_time = measure("Fast detect_type", lambda ls: [detect_type(v) for v in ls], lines)
+    
+    print(f"\nSpeedup: {before_time / after_time:.1f}x")
+    if before == after:
+        print("✓ Output identical to the original classifier")
+    else:
+        mismatches = sum(1 for a, b in zip(before, after) if a != b)
+        print(f"✗ Output differs from the original classifier on {mismatches} lines")
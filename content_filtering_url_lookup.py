@@ -0,0 +1,221 @@
+import fnmatch
+import json
+import os
+import re
+import time
+from datetime import datetime
+from meraki_url_patterns import CONTENT_FILTERING_LISTS, PatternTrie, normalize_pattern, parse_url
+
+# --- Configuration ---
+# Content filtering exports (single network or org-wide) and/or full backup
+# folders; folders are searched recursively for .json files
+INPUT_PATHS = ["contentFilteringOrgExport.json"]
+URLS = []  # URLs to check: ["https://www.example.com/page", ...]
+URL_FILE = ""  # Optional: file with one URL per line
+REPORT_FILE = "content_filtering_url_report.json"
+EXAMPLES_TO_SHOW = 5  # Networks printed per verdict for each URL
+
+def iter_json_files(path):
+    """
+    Yield a file path, or every .json file under a folder.
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(".json"):
+                    yield os.path.join(root, name)
+    else:
+        yield path
+
+def load_policies(paths):
+    """
+    Load content filtering policies from exports and full backups.
+    Returns (policies, networks) where policies maps a policy key to its
+    {"allowedUrlPatterns", "blockedUrlPatterns"} and networks maps each
+    network ID to {"name", "policy"}. Identical policies share one key.
+    
+    Files are read in sorted path order. If several files cover the same
+    network, the newest export wins (the org export's exportedAt time,
+    otherwise the file's modification time).
+    """
+    policies = {}
+    networks = {}
+    
+    def add(network_id, name, config, exported_at):
+        current = networks.get(network_id)
+        if current is not None and current["exportedAt"] > exported_at:
+            return
+        allowed = config.get("allowedUrlPatterns") or []
+        blocked = config.get("blockedUrlPatterns") or []
+        key = json.dumps([sorted(allowed), sorted(blocked)])
+        policies.setdefault(key, {"allowedUrlPatterns": allowed, "blockedUrlPatterns": blocked})
+        networks[network_id] = {"name": name, "policy": key, "exportedAt": exported_at}
+    
+    filenames = sorted({filename for path in paths for filename in iter_json_files(path)})
+    for filename in filenames:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            continue
+        
+        if "policies" in data and "networks" in data:
+            # Org-wide export from meraki_export_content_filter.py
+            exported_at = (datetime.fromisoformat(data["exportedAt"]).timestamp()
+                           if data.get("exportedAt") else os.path.getmtime(filename))
+            for network_id, entry in data["networks"].items():
+                add(network_id, entry.get("name", network_id), data["policies"][entry["policy"]], exported_at)
+        elif "network" in data:
+            # Full backup network file from meraki_full_backup.py
+            network = data["network"] or {}
+            config = (network.get("appliance") or {}).get("contentFiltering")
+            if config:
+                info = network.get("info") or {}
+                network_id = info.get("id", filename)
+                add(network_id, info.get("name", network_id), config, os.path.getmtime(filename))
+        elif any(key in data for key in CONTENT_FILTERING_LISTS):
+            # Single network export, named after the file
+            name = os.path.splitext(os.path.basename(filename))[0]
+            add(name, name, data, os.path.getmtime(filename))
+    
+    # Drop policies that were only used by entries a newer export replaced
+    used = {entry["policy"] for entry in networks.values()}
+    policies = {key: policy for key, policy in policies.items() if key in used}
+    return policies, networks
+
+class PolicyMatcher:
+    """
+    Evaluates URLs against every loaded policy at once.
+    
+    Patterns from all policies go into a single reversed-domain trie, so a
+    lookup walks the URL's host labels once regardless of how many
+    networks there are. Patterns with wildcards the trie cannot express
+    (anything other than a leading "*.") are kept in a small regex table.
+    """
+    
+    def __init__(self, policies):
+        self.trie = PatternTrie()
+        self.wildcards = []
+        for key, policy in policies.items():
+            for action, list_key in (("allow", "allowedUrlPatterns"), ("block", "blockedUrlPatterns")):
+                for pattern in policy[list_key]:
+                    normalized = normalize_pattern(pattern)
+                    if not normalized:
+                        continue
+                    value = (key, action, pattern)
+                    rest = normalized[2:] if normalized.startswith('*.') else normalized
+                    if '*' in rest or '?' in rest:
+                        regex = re.compile(fnmatch.translate(normalized) + r'|' + fnmatch.translate(normalized + '/*'))
+                        self.wildcards.append((regex, value))
+                    else:
+                        self.trie.add(normalized, value)
+    
+    def evaluate(self, url):
+        """
+        Return {policy_key: (verdict, pattern)} for every policy with a
+        matching pattern. Allowed patterns take precedence over blocked
+        ones; among the same action the most specific host wins.
+        """
+        best = {}
+        for depth, (key, action, pattern) in self.trie.matches(url):
+            rank = (action == "allow", depth)
+            if key not in best or rank > best[key][0]:
+                best[key] = (rank, action, pattern)
+        
+        if self.wildcards:
+            labels, path = parse_url(url)
+            target = ".".join(reversed(labels)) + (f"/{path}" if path else "")
+            for regex, (key, action, pattern) in self.wildcards:
+                if regex.match(target):
+                    rank = (action == "allow", 0)
+                    if key not in best or rank > best[key][0]:
+                        best[key] = (rank, action, pattern)
+        
+        return {
+            key: ("allowed" if action == "allow" else "blocked", pattern)
+            for key, (_, action, pattern) in best.items()
+        }
+
+def check_urls(matcher, networks, urls):
+    """
+    Evaluate every URL for every network.
+    Returns a list of {"url", "blocked", "allowed", "unmatched"} where the
+    blocked/allowed lists hold {"networkId", "name", "pattern"} entries.
+    Networks without a matching pattern may still block by category.
+    """
+    # Group networks by policy so each policy is evaluated once per URL
+    by_policy = {}
+    for network_id, entry in networks.items():
+        by_policy.setdefault(entry["policy"], []).append((network_id, entry["name"]))
+    
+    results = []
+    for url in urls:
+        verdicts = matcher.evaluate(url)
+        result = {"url": url, "blocked": [], "allowed": [], "unmatched": 0}
+        for key, members in by_policy.items():
+            if key not in verdicts:
+                result["unmatched"] += len(members)
+                continue
+            verdict, pattern = verdicts[key]
+            for network_id, name in members:
+                result[verdict].append({"networkId": network_id, "name": name, "pattern": pattern})
+        results.append(result)
+    return results
+
+def display_results(results):
+    """
+    Print a per-URL summary.
+    """
+    for result in results:
+        print(f"\n{result['url']}")
+        print(f"  Blocked: {len(result['blocked'])}   Allowed: {len(result['allowed'])}   "
+              f"No pattern match: {result['unmatched']}")
+        for verdict in ("blocked", "allowed"):
+            for match in result[verdict][:EXAMPLES_TO_SHOW]:
+                print(f"    {verdict:<8} {match['name']} ({match['networkId']}) by {match['pattern']}")
+            if len(result[verdict]) > EXAMPLES_TO_SHOW:
+                print(f"    ... and {len(result[verdict]) - EXAMPLES_TO_SHOW} more {verdict}")
+
+def load_urls():
+    """
+    Collect URLs from URLS and URL_FILE.
+    """
+    urls = list(URLS)
+    if URL_FILE:
+        with open(URL_FILE, 'r') as f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    return urls
+
+def main():
+    """
+    Check URLS and URL_FILE against the exports in INPUT_PATHS.
+    """
+    print("=" * 70)
+    print("Content Filtering URL Lookup")
+    print("=" * 70)
+    
+    try:
+        policies, networks = load_policies(INPUT_PATHS)
+        print(f"\nLoaded {len(networks)} networks ({len(policies)} distinct policies)")
+        
+        matcher = PolicyMatcher(policies)
+        urls = load_urls()
+        
+        start = time.perf_counter()
+        results = check_urls(matcher, networks, urls)
+        elapsed = time.perf_counter() - start
+        
+        display_results(results)
+        if elapsed > 0:
+            print(f"\nChecked {len(urls)} URLs in {elapsed:.3f}s ({len(urls) / elapsed:,.0f} URLs/s)")
+        print("Note: category blocking is not evaluated offline.")
+        
+        with open(REPORT_FILE, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Report saved to: {REPORT_FILE}")
+    
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+
+if __name__ == "__main__":
+    main()
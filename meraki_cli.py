@@ -0,0 +1,317 @@
+import time
+
+# Taken before the remaining imports so --timings covers the whole CLI startup
+_STARTED = time.perf_counter()
+
+import argparse
+import importlib
+import os
+import sys
+
+# Every subcommand runs one of the scripts in this folder. Scripts are only
+# imported once their subcommand is chosen, so --help and offline commands
+# (convert, content-filter lookup) never import the Meraki SDK.
+#
+# The API key is read by the SDK from MERAKI_DASHBOARD_API_KEY. Defaults for
+# --org and --network come from MERAKI_ORGANIZATION_ID and MERAKI_NETWORK_ID.
+# Settings not given on the command line keep the script's own defaults.
+
+TIMINGS = []  # (label, seconds) for --timings
+
+def timed(label, func, *args):
+    """
+    Run func and record how long it took.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    TIMINGS.append((label, time.perf_counter() - start))
+    return result
+
+def load_script(module_name, needs_api, settings):
+    """
+    Import a script module and override its configuration constants.
+    Settings whose value is None are left at the script's default.
+    """
+    if needs_api:
+        timed("Meraki SDK import", importlib.import_module, "meraki")
+    module = timed(f"{module_name} import", importlib.import_module, module_name)
+    for name, value in settings.items():
+        if value is not None:
+            setattr(module, name, value)
+    return module
+
+def negate(flag):
+    """
+    Turn a --skip/--no style flag (True or None) into a setting value.
+    """
+    return False if flag else None
+
+def org_list(orgs):
+    """
+    Repeated --org flags, falling back to MERAKI_ORGANIZATION_ID.
+    """
+    if orgs:
+        return orgs
+    org_id = os.environ.get("MERAKI_ORGANIZATION_ID")
+    return [org_id] if org_id else None
+
+def split_networks(networks):
+    """
+    One --network (or MERAKI_NETWORK_ID) sets NETWORK_ID, several set NETWORK_IDS.
+    """
+    if not networks:
+        return os.environ.get("MERAKI_NETWORK_ID"), None
+    if len(networks) == 1:
+        return networks[0], None
+    return None, networks
+
+def run_backup(args):
+    module = load_script("meraki_full_backup", True, {
+        "ORGANIZATION_IDS": org_list(args.org),
+        "OUTPUT_DIR": args.output_dir,
+        "BACKUP_NETWORKS": negate(args.skip_networks),
+        "BACKUP_DEVICES": negate(args.skip_devices),
+        "BACKUP_TEMPLATES": negate(args.skip_templates)
+    })
+    module.main()
+
+def run_export(args):
+    module = load_script("meraki_export_configs", True, {
+        "ORGANIZATION_ID": args.org,
+        "OUTPUT_DIR": args.output_dir,
+        "INCLUDE_DEVICES": negate(args.skip_devices),
+        "INCLUDE_CLIENTS": args.clients,
+        "INCLUDE_SWITCH_PORTS": args.switch_ports,
+        "EXPORT_SQLITE": args.sqlite
+    })
+    module.main()
+
+def run_restore(args):
+    module = load_script("meraki_restore", True, {
+        "BACKUP_FILE": args.backup_file,
+        "TARGET_NETWORK_ID": args.network,
+        "DRY_RUN": negate(args.apply),
+        "UPDATE_EXISTING": negate(args.skip_existing)
+    })
+    module.main()
+
+def run_policy_objects(args):
+    module = load_script("meraki_policy_objects_updater", True, {
+        "JSON_FILE": args.file,
+        "ORGANIZATION_IDS": org_list(args.org),
+        "ALL_ORGANIZATIONS": args.all_orgs,
+        "CHANGES_FILE": args.changes,
+        "DRY_RUN": negate(args.apply),
+        "SYNC_MODE": args.sync,
+        "AGGREGATE_CIDRS": args.aggregate,
+        "BULK_MODE": args.bulk
+    })
+    module.main()
+
+def run_content_filter_push(args):
+    network_id, network_ids = split_networks(args.network)
+    module = load_script("meraki_content_filtering_add", True, {
+        "JSON_CONFIG_FILE": args.config,
+        "NETWORK_ID": network_id,
+        "NETWORK_IDS": network_ids,
+        "ORGANIZATION_ID": args.org,
+        "NETWORK_TAG": args.tag,
+        "ALL_APPLIANCE_NETWORKS": args.all_networks,
+        "OPTIMIZE_PATTERNS": args.optimize,
+        "MERGE_MODE": args.merge,
+        "REMOVE_CONFIG_FILE": args.remove
+    })
+    module.main()
+
+def run_content_filter_clear(args):
+    network_id, network_ids = split_networks(args.network)
+    module = load_script("meraki_content_filtering_delete", True, {
+        "NETWORK_ID": network_id,
+        "NETWORK_IDS": network_ids,
+        "ORGANIZATION_ID": args.org,
+        "NETWORK_TAG": args.tag,
+        "ALL_APPLIANCE_NETWORKS": args.all_networks,
+        "REMOVE_CONFIG_FILE": args.remove,
+        "RESTORE_SNAPSHOT_FILE": args.restore,
+        "DRY_RUN": args.dry_run
+    })
+    module.main()
+
+def run_content_filter_export(args):
+    module = load_script("meraki_export_content_filter", True, {
+        "NETWORK_ID": args.network,
+        "ORGANIZATION_ID": args.org if args.all_networks or args.tag else None,
+        "NETWORK_TAG": args.tag,
+        "OUTPUT_FILE": args.output,
+        "ORG_OUTPUT_FILE": args.output,
+        "OPTIMIZE_PATTERNS": args.optimize,
+        "REFRESH_CATEGORIES": args.refresh_categories
+    })
+    module.main()
+
+def run_content_filter_lookup(args):
+    module = load_script("content_filtering_url_lookup", False, {
+        "INPUT_PATHS": args.input,
+        "URLS": args.urls or None,
+        "URL_FILE": args.url_file,
+        "REPORT_FILE": args.report
+    })
+    module.main()
+
+def run_convert(args):
+    module = load_script("policy_object_txt_to_json", False, {
+        "INPUT_FILE": args.input_file,
+        "OUTPUT_FILE": args.output,
+        "INPUT_FORMAT": args.input_format,
+        "OUTPUT_FORMAT": args.output_format,
+        "WORKERS": args.workers,
+        "INCREMENTAL": args.incremental,
+        "AGGREGATE_CIDRS": args.aggregate
+    })
+    module.main()
+
+def add_network_targets(parser, org_default):
+    """
+    Network selection flags shared by content-filter push and clear.
+    """
+    parser.add_argument("--network", action="append", default=None,
+                        help="network ID (repeat for several networks)")
+    parser.add_argument("--org", default=org_default, help="organization for --tag / --all-networks")
+    parser.add_argument("--tag", help="every appliance network in --org with this tag")
+    parser.add_argument("--all-networks", action="store_true", default=None,
+                        help="every appliance network in --org")
+    parser.add_argument("--remove", help="JSON file of patterns/categories to remove")
+
+def build_parser():
+    """
+    Build the argument parser with one subcommand per script.
+    """
+    org_default = os.environ.get("MERAKI_ORGANIZATION_ID")
+    network_default = os.environ.get("MERAKI_NETWORK_ID")
+    
+    parser = argparse.ArgumentParser(
+        prog="meraki_cli.py",
+        description="Meraki Dashboard scripts. API commands read the key from MERAKI_DASHBOARD_API_KEY."
+    )
+    parser.add_argument("--timings", action="store_true",
+                        default=os.environ.get("MERAKI_CLI_TIMINGS") == "1",
+                        help="report startup and import times (or set MERAKI_CLI_TIMINGS=1)")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+    
+    backup = commands.add_parser("backup", help="full backup of one or more organizations")
+    backup.add_argument("--org", action="append",
+                        help="organization ID (repeat for several; default: all)")
+    backup.add_argument("--output-dir")
+    backup.add_argument("--skip-networks", action="store_true", default=None)
+    backup.add_argument("--skip-devices", action="store_true", default=None)
+    backup.add_argument("--skip-templates", action="store_true", default=None)
+    backup.set_defaults(handler=run_backup)
+    
+    export = commands.add_parser("export", help="per-network configuration export")
+    export.add_argument("--org", default=org_default)
+    export.add_argument("--output-dir")
+    export.add_argument("--skip-devices", action="store_true", default=None)
+    export.add_argument("--clients", action="store_true", default=None, help="include client lists")
+    export.add_argument("--switch-ports", action="store_true", default=None, help="include switch port configs")
+    export.add_argument("--sqlite", action="store_true", default=None, help="also write flattened export.db")
+    export.set_defaults(handler=run_export)
+    
+    restore = commands.add_parser("restore", help="restore a network from a backup file")
+    restore.add_argument("backup_file")
+    restore.add_argument("--network", default=network_default, help="target network ID")
+    restore.add_argument("--apply", action="store_true", default=None, help="make changes (default: dry run)")
+    restore.add_argument("--skip-existing", action="store_true", default=None,
+                         help="do not update objects that already exist")
+    restore.set_defaults(handler=run_restore)
+    
+    policy = commands.add_parser("policy-objects", help="create/update policy objects from JSON")
+    policy.add_argument("--file", help="converter output (.json or .ndjson)")
+    policy.add_argument("--org", action="append",
+                        help="organization ID (repeat for several)")
+    policy.add_argument("--all-orgs", action="store_true", default=None)
+    policy.add_argument("--changes", help="converter changes manifest (only upload changed groups)")
+    policy.add_argument("--apply", action="store_true", default=None, help="make changes (default: dry run)")
+    policy.add_argument("--sync", action="store_true", default=None, help="delete objects removed from the file")
+    policy.add_argument("--aggregate", action="store_true", default=None, help="collapse CIDRs before upload")
+    policy.add_argument("--bulk", action="store_true", default=None, help="create objects with action batches")
+    policy.set_defaults(handler=run_policy_objects)
+    
+    content = commands.add_parser("content-filter", help="content filtering push/clear/export/lookup")
+    actions = content.add_subparsers(dest="action", metavar="action")
+    actions.required = True
+    
+    push = actions.add_parser("push", help="apply a content filtering JSON file")
+    push.add_argument("--config", help="content filtering JSON file")
+    add_network_targets(push, org_default)
+    push.add_argument("--merge", action="store_true", default=None,
+                      help="add to the current lists instead of replacing them")
+    push.add_argument("--optimize", action="store_true", default=None,
+                      help="normalize, dedupe and drop subsumed URL patterns before pushing")
+    push.set_defaults(handler=run_content_filter_push)
+    
+    clear = actions.add_parser("clear", help="clear (or partially remove) content filtering")
+    add_network_targets(clear, org_default)
+    clear.add_argument("--restore", metavar="SNAPSHOT", help="restore a bulk snapshot instead")
+    clear.add_argument("--dry-run", action="store_true", default=None,
+                       help="show what would change without making changes")
+    clear.set_defaults(handler=run_content_filter_clear)
+    
+    cf_export = actions.add_parser("export", help="export content filtering")
+    cf_export.add_argument("--network", default=network_default)
+    cf_export.add_argument("--org", default=org_default)
+    cf_export.add_argument("--tag", help="org-wide export of networks with this tag")
+    cf_export.add_argument("--all-networks", action="store_true", help="org-wide export of every appliance network")
+    cf_export.add_argument("--output")
+    cf_export.add_argument("--optimize", action="store_true", default=None, help="write optimized URL patterns")
+    cf_export.add_argument("--refresh-categories", action="store_true", default=None,
+                           help="ignore the cached category list")
+    cf_export.set_defaults(handler=run_content_filter_export)
+    
+    lookup = actions.add_parser("lookup", help="check URLs against exports offline")
+    lookup.add_argument("urls", nargs="*")
+    lookup.add_argument("--input", action="append", help="export file or backup folder (repeatable)")
+    lookup.add_argument("--url-file")
+    lookup.add_argument("--report")
+    lookup.set_defaults(handler=run_content_filter_lookup)
+    
+    convert = commands.add_parser("convert", help="convert feeds to policy object JSON (offline)")
+    convert.add_argument("input_file")
+    convert.add_argument("-o", "--output")
+    convert.add_argument("--input-format", choices=["auto", "text", "csv", "hosts", "ioc"])
+    convert.add_argument("--output-format", choices=["json", "ndjson"])
+    convert.add_argument("--workers", type=int, help="parser processes (0 = all cores)")
+    convert.add_argument("--incremental", action="store_true", default=None)
+    convert.add_argument("--aggregate", action="store_true", default=None)
+    convert.set_defaults(handler=run_convert)
+    
+    return parser
+
+def display_timings(ready, total):
+    """
+    Print startup and command timings to stderr.
+    """
+    print("\nTimings:", file=sys.stderr)
+    print(f"  {'CLI ready':<40} {ready * 1000:9.1f} ms", file=sys.stderr)
+    for label, seconds in TIMINGS:
+        print(f"  {label:<40} {seconds * 1000:9.1f} ms", file=sys.stderr)
+    print(f"  {'Total':<40} {total * 1000:9.1f} ms", file=sys.stderr)
+
+def main(argv=None):
+    """
+    Parse arguments and run the chosen subcommand.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # Without an organization the scripts would quietly fall back to NETWORK_ID
+    if (getattr(args, "tag", None) or getattr(args, "all_networks", False)) and not args.org:
+        parser.error("--tag / --all-networks need --org (or MERAKI_ORGANIZATION_ID)")
+    ready = time.perf_counter() - _STARTED
+    try:
+        timed("Command (including imports)", args.handler, args)
+    finally:
+        if args.timings:
+            display_timings(ready, time.perf_counter() - _STARTED)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Default Settings ---
+INITIAL_CONCURRENCY = 2  # Parallel API calls to start with
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 10  # Dashboard allows ~10 requests/second per organization
+BACKOFF_FACTOR = 0.5  # Multiply concurrency by this on every 429
+DEFAULT_RETRY_AFTER = 2  # Seconds to wait on a 429 without a Retry-After header
+MAX_RETRIES = 5  # Attempts per call before giving up on repeated 429s
+STATUS_INTERVAL = 10  # Seconds between progress/status lines (0 = never)
+
+def is_rate_limited(error):
+    """
+    Check whether an exception is a 429 (Too Many Requests) from the API.
+    """
+    return getattr(error, "status", None) == 429
+
+def get_retry_after(error):
+    """
+    Read the Retry-After header (in seconds) from a 429 error, if present.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveConcurrencyController:
+    """
+    Runs API calls concurrently with an AIMD (additive increase,
+    multiplicative decrease) limit on the number of calls in flight.
+    
+    Every successful call grows the limit by 1/limit (so roughly +1 per
+    full round of calls). Every 429 halves the limit and pauses all new
+    calls until the Retry-After time has passed; the call is then retried.
+    """
+    
+    def __init__(self, name="API", initial=INITIAL_CONCURRENCY, minimum=MIN_CONCURRENCY,
+                 maximum=MAX_CONCURRENCY, max_retries=MAX_RETRIES, status_interval=STATUS_INTERVAL):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.max_retries = max_retries
+        self.status_interval = status_interval
+        self.limit = float(max(minimum, min(initial, maximum)))
+        
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._backoff_until = 0.0
+        self._started = None
+        self._last_status = 0.0
+        
+        self.succeeded = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.backoff_seconds = 0.0
+    
+    def _acquire(self):
+        with self._cond:
+            while True:
+                wait = self._backoff_until - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                elif self._in_flight >= int(self.limit):
+                    self._cond.wait()
+                else:
+                    self._in_flight += 1
+                    return
+    
+    def _release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+    
+    def _on_success(self):
+        with self._cond:
+            self.succeeded += 1
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+    
+    def _on_rate_limited(self, error, attempt):
+        with self._cond:
+            self.rate_limited += 1
+            self.limit = max(self.minimum, self.limit * BACKOFF_FACTOR)
+            
+            # Honour Retry-After, otherwise back off exponentially with jitter
+            wait = get_retry_after(error)
+            if wait is None:
+                wait = DEFAULT_RETRY_AFTER * (2 ** attempt) + random.random()
+            until = time.monotonic() + wait
+            if until > self._backoff_until:
+                self.backoff_seconds += until - max(self._backoff_until, time.monotonic())
+                self._backoff_until = until
+    
+    def call(self, func, *args, **kwargs):
+        """
+        Run a single call under the controller, retrying on 429s.
+        """
+        if self._started is None:
+            self._started = self._last_status = time.monotonic()
+        
+        for attempt in range(self.max_retries + 1):
+            self._acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if is_rate_limited(e) and attempt < self.max_retries:
+                    self._on_rate_limited(e, attempt)
+                    continue
+                with self._cond:
+                    self.failed += 1
+                raise
+            finally:
+                self._release()
+            self._on_success()
+            self._maybe_report()
+            return result
+    
+    def map(self, func, items):
+        """
+        Apply func to every item concurrently.
+        Returns a list of (item, result, error) tuples in input order.
+        """
+        items = list(items)
+        if self._started is None:
+            self._started = self._last_status = time.monotonic()
+        
+        def run(item):
+            try:
+                return item, self.call(func, item), None
+            except Exception as e:
+                return item, None, e
+        
+        with ThreadPoolExecutor(max_workers=self.maximum) as executor:
+            return list(executor.map(run, items))
+    
+    def stats(self):
+        """
+        Current throughput and backoff state.
+        """
+        with self._cond:
+            now = time.monotonic()
+            elapsed = now - self._started if self._started else 0.0
+            completed = self.succeeded + self.failed
+            return {
+                "concurrency": int(self.limit),
+                "in_flight": self._in_flight,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "rate_limited": self.rate_limited,
+                "calls_per_second": completed / elapsed if elapsed > 0 else 0.0,
+                "backoff_remaining": max(0.0, self._backoff_until - now),
+                "backoff_seconds": self.backoff_seconds,
+                "elapsed": elapsed
+            }
+    
+    def format_stats(self):
+        """
+        One-line human readable status.
+        """
+        s = self.stats()
+        line = (f"[{self.name}] {s['succeeded']} ok, {s['failed']} failed, "
+                f"{s['calls_per_second']:.1f} calls/s, concurrency {s['concurrency']}, "
+                f"{s['rate_limited']} rate limited ({s['backoff_seconds']:.1f}s backing off)")
+        if s["backoff_remaining"] > 0:
+            line += f", paused for {s['backoff_remaining']:.1f}s"
+        return line
+    
+    def _maybe_report(self):
+        if not self.status_interval:
+            return
+        now = time.monotonic()
+        with self._cond:
+            if now - self._last_status < self.status_interval:
+                return
+            self._last_status = now
+        print(f"  {self.format_stats()}")
@@ -1,33 +1,68 @@
 import meraki
 import json
+from meraki_concurrency import AdaptiveConcurrencyController, is_rate_limited
+from meraki_url_patterns import (display_optimization_report, has_changes, merge_content_filtering,
+                                 optimize_content_filtering)
+from meraki_networks import get_target_networks
+from meraki_session import get_dashboard
 
 # --- Configuration ---
 NETWORK_ID = ""  # Replace with your Meraki Network ID
 JSON_CONFIG_FILE = "contentFilteringoutput.json"
+OPTIMIZE_PATTERNS = False  # Normalize, dedupe and drop subsumed URL patterns before pushing
+
+# Merge mode: add JSON_CONFIG_FILE to the current lists instead of replacing them,
+# and skip the update entirely when the lists would not change
+MERGE_MODE = False
+REMOVE_CONFIG_FILE = ""  # Optional (merge mode): patterns/categories to remove
+
+# Multi-network mode (any of these overrides NETWORK_ID)
+NETWORK_IDS = []  # Explicit list of networks: ["L_123", "L_456"]
+ORGANIZATION_ID = ""  # Needed for NETWORK_TAG / ALL_APPLIANCE_NETWORKS
+NETWORK_TAG = ""  # Every appliance network in ORGANIZATION_ID with this tag
+ALL_APPLIANCE_NETWORKS = False  # Every appliance network in ORGANIZATION_ID
+MAX_CONCURRENCY = 10  # Upper bound for parallel updates (adapts to 429s)
 
 # Initialize the Meraki Dashboard API
-dashboard = meraki.DashboardAPI()
+dashboard = get_dashboard()
+
+# Bulk updates run under the adaptive controller, which handles 429s itself
+write_dashboard = get_dashboard(wait_on_rate_limit=False, concurrency=MAX_CONCURRENCY)
+
+def normalize_config(config_data):
+    """
+    Turn an exported content filtering config into API parameters.
+    """
+    allowed_patterns = config_data.get("allowedUrlPatterns", [])
+    blocked_categories_raw = config_data.get("blockedUrlCategories", [])
+    blocked_patterns = config_data.get("blockedUrlPatterns", [])
+    
+    # Extract just the IDs from blocked categories if they're objects
+    # The API expects a list of strings like ["meraki:contentFiltering/category/C2", ...]
+    blocked_categories = []
+    if blocked_categories_raw:
+        if isinstance(blocked_categories_raw[0], dict):
+            # If categories are objects with 'id' field, extract the IDs
+            blocked_categories = [cat["id"] for cat in blocked_categories_raw]
+        else:
+            # If they're already strings, use as-is
+            blocked_categories = blocked_categories_raw
+    
+    return {
+        "allowedUrlPatterns": allowed_patterns,
+        "blockedUrlCategories": blocked_categories,
+        "blockedUrlPatterns": blocked_patterns
+    }
 
 def update_content_filtering(network_id, config_data):
     """
     Updates the content filtering settings for a given network.
     """
     try:
-        # Get the data from JSON
-        allowed_patterns = config_data.get("allowedUrlPatterns", [])
-        blocked_categories_raw = config_data.get("blockedUrlCategories", [])
-        blocked_patterns = config_data.get("blockedUrlPatterns", [])
-        
-        # Extract just the IDs from blocked categories if they're objects
-        # The API expects a list of strings like ["meraki:contentFiltering/category/C2", ...]
-        blocked_categories = []
-        if blocked_categories_raw:
-            if isinstance(blocked_categories_raw[0], dict):
-                # If categories are objects with 'id' field, extract the IDs
-                blocked_categories = [cat["id"] for cat in blocked_categories_raw]
-            else:
-                # If they're already strings, use as-is
-                blocked_categories = blocked_categories_raw
+        settings = normalize_config(config_data)
+        allowed_patterns = settings["allowedUrlPatterns"]
+        blocked_categories = settings["blockedUrlCategories"]
+        blocked_patterns = settings["blockedUrlPatterns"]
         
         print(f"Attempting to update content filtering with:")
         print(f"  Allowed URL Patterns: {len(allowed_patterns)} patterns")
@@ -52,6 +87,82 @@ def update_content_filtering(network_id, config_data):
         print(f"Reason: {e.reason}")
         print(f"Message: {e.message}")
 
+def merge_update(api, network_id, add_data, remove_data):
+    """
+    Fetch the current settings, apply the add/remove sets and update the
+    network only if the result differs. Returns (updated, changes).
+    """
+    current = api.appliance.getNetworkApplianceContentFiltering(network_id)
+    settings, changes = merge_content_filtering(current, add_data, remove_data)
+    if not has_changes(changes):
+        return False, changes
+    api.appliance.updateNetworkApplianceContentFiltering(network_id, **settings)
+    return True, changes
+
+def describe_changes(changes):
+    """
+    Short "+added/-removed" summary per list.
+    """
+    return ", ".join(
+        f"{key} +{len(change['added'])}/-{len(change['removed'])}"
+        for key, change in changes.items()
+        if change["added"] or change["removed"]
+    )
+
+def merge_content_filtering_update(network_id, add_data, remove_data):
+    """
+    Merge add/remove sets into a single network's content filtering.
+    """
+    try:
+        updated, changes = merge_update(dashboard, network_id, add_data, remove_data)
+        if updated:
+            print(f"\n✓ Content filtering updated for network {network_id}: {describe_changes(changes)}")
+        else:
+            print(f"\n✓ Content filtering for network {network_id} already up to date. No update sent.")
+    except meraki.APIError as e:
+        print(f"✗ Error updating content filtering for network {network_id}: {e}")
+        print(f"Status code: {e.status}")
+        print(f"Reason: {e.reason}")
+        print(f"Message: {e.message}")
+
+def update_content_filtering_bulk(networks, config_data, merge=False, remove_data=None):
+    """
+    Apply the same content filtering settings to many networks concurrently.
+    The config is normalized once; calls run under the adaptive rate controller.
+    In merge mode each network's current lists are fetched and only
+    networks whose lists actually change are updated.
+    Returns a list of (network_id, name, ok, message) results.
+    """
+    settings = normalize_config(config_data)
+    controller = AdaptiveConcurrencyController(name="content filtering", maximum=MAX_CONCURRENCY)
+    
+    def apply(network):
+        network_id, _ = network
+        if merge:
+            updated, changes = merge_update(write_dashboard, network_id, config_data, remove_data)
+            return f"Updated ({describe_changes(changes)})" if updated else "Unchanged (skipped)"
+        write_dashboard.appliance.updateNetworkApplianceContentFiltering(network_id, **settings)
+        return "Updated"
+    
+    results = []
+    for (network_id, name), message, error in controller.map(apply, networks):
+        if error is None:
+            results.append((network_id, name, True, message))
+        elif is_rate_limited(error):
+            results.append((network_id, name, False, "Rate limited (retries exhausted)"))
+        else:
+            results.append((network_id, name, False, str(error)))
+    
+    print(f"\n{'Network':<24} {'Name':<30} Result")
+    for network_id, name, ok, message in results:
+        print(f"{network_id:<24} {name[:30]:<30} {'✓' if ok else '✗'} {message}")
+    
+    succeeded = sum(1 for r in results if r[2])
+    unchanged = sum(1 for r in results if r[2] and r[3].startswith("Unchanged"))
+    print(f"\n✓ Updated: {succeeded - unchanged}   = Unchanged: {unchanged}   ✗ Failed: {len(results) - succeeded}")
+    print(controller.format_stats())
+    return results
+
 def load_config_from_json(file_path):
     """
     Loads content filtering configuration from a JSON file.
@@ -69,12 +180,45 @@ def load_config_from_json(file_path):
         print(f"Error: Invalid JSON format in {file_path}")
         return None
 
-if __name__ == "__main__":
+def main():
+    """
+    Push JSON_CONFIG_FILE to the configured network(s).
+    """
     # Load configuration from JSON file
     config_data = load_config_from_json(JSON_CONFIG_FILE)
     
-    if config_data:
+    if config_data and OPTIMIZE_PATTERNS:
+        # Push the smallest equivalent pattern lists
+        config_data, report = optimize_content_filtering(config_data)
+        display_optimization_report(report)
+    
+    # Merge mode can also remove entries
+    remove_data = load_config_from_json(REMOVE_CONFIG_FILE) if MERGE_MODE and REMOVE_CONFIG_FILE else None
+    
+    if not config_data:
+        print("Failed to load configuration. Exiting.")
+    elif MERGE_MODE and REMOVE_CONFIG_FILE and remove_data is None:
+        print("Failed to load removal configuration. Exiting.")
+    elif NETWORK_IDS or NETWORK_TAG or ALL_APPLIANCE_NETWORKS:
+        # Update content filtering for many networks at once
+        networks = get_target_networks(
+            dashboard, NETWORK_IDS, ORGANIZATION_ID, NETWORK_TAG, ALL_APPLIANCE_NETWORKS
+        )
+        if not networks:
+            print("No target networks found. Exiting.")
+        else:
+            print(f"\nTarget networks: {len(networks)}")
+            response = input("Apply this configuration to all of them? (yes/no): ").strip().lower()
+            if response in ['yes', 'y']:
+                update_content_filtering_bulk(networks, config_data, merge=MERGE_MODE, remove_data=remove_data)
+            else:
+                print("Operation cancelled.")
+    elif MERGE_MODE:
+        # Merge into the specified network's current settings
+        merge_content_filtering_update(NETWORK_ID, config_data, remove_data)
+    else:
         # Update content filtering for the specified network
         update_content_filtering(NETWORK_ID, config_data)
-    else:
-        print("Failed to load configuration. Exiting.")
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
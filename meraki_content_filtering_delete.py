@@ -1,11 +1,29 @@
 import meraki
 import json
+from datetime import datetime
+from meraki_concurrency import AdaptiveConcurrencyController
+from meraki_url_patterns import CONTENT_FILTERING_LISTS, category_ids, has_changes, merge_content_filtering
+from meraki_networks import get_target_networks
+from meraki_session import get_dashboard
 
 # --- Configuration ---
 NETWORK_ID = ""  # Replace with your Meraki Network ID
+REMOVE_CONFIG_FILE = ""  # Optional: only remove the patterns/categories listed in this JSON file (single or bulk)
+
+# Bulk mode (any of these overrides NETWORK_ID)
+NETWORK_IDS = []  # Explicit list of networks: ["L_123", "L_456"]
+ORGANIZATION_ID = ""  # Needed for NETWORK_TAG / ALL_APPLIANCE_NETWORKS
+NETWORK_TAG = ""  # Every appliance network in ORGANIZATION_ID with this tag
+ALL_APPLIANCE_NETWORKS = False  # Every appliance network in ORGANIZATION_ID
+MAX_CONCURRENCY = 10  # Upper bound for parallel calls (adapts to 429s)
+RESTORE_SNAPSHOT_FILE = ""  # Set to a bulk snapshot file to restore it instead of clearing
+DRY_RUN = False  # Show what a clear, removal or restore would change without making changes
 
 # Initialize the Meraki Dashboard API
-dashboard = meraki.DashboardAPI()
+dashboard = get_dashboard()
+
+# Bulk calls run under the adaptive controller, which handles 429s itself
+write_dashboard = get_dashboard(wait_on_rate_limit=False, concurrency=MAX_CONCURRENCY)
 
 def get_current_content_filtering(network_id):
     """
@@ -20,21 +38,37 @@ def get_current_content_filtering(network_id):
         print(f"Error retrieving content filtering: {e}")
         return None
 
+def backup_current_settings(network_id, backup):
+    """
+    Fetch the current settings and optionally save them to a backup file.
+    """
+    if backup:
+        print("\n--- Backing up current settings ---")
+    current_settings = get_current_content_filtering(network_id)
+    if backup and current_settings:
+        backup_filename = f"content_filtering_backup_{network_id}.json"
+        with open(backup_filename, 'w') as f:
+            json.dump(current_settings, f, indent=2)
+        print(f"✓ Backup saved to: {backup_filename}\n")
+    return current_settings
+
 def clear_content_filtering(network_id, backup=True):
     """
     Clears all content filtering settings for a given network.
     Sets all URL patterns and categories to empty lists.
+    Skips the update if everything is already empty.
     """
     try:
         # Optionally backup current settings first
-        if backup:
-            print("\n--- Backing up current settings ---")
-            current_settings = get_current_content_filtering(network_id)
-            if current_settings:
-                backup_filename = f"content_filtering_backup_{network_id}.json"
-                with open(backup_filename, 'w') as f:
-                    json.dump(current_settings, f, indent=2)
-                print(f"✓ Backup saved to: {backup_filename}\n")
+        current_settings = backup_current_settings(network_id, backup)
+        
+        if current_settings is not None and not any(current_settings.get(key) for key in CONTENT_FILTERING_LISTS):
+            print(f"✓ Content filtering for network {network_id} is already clear. No update sent.")
+            return current_settings
+        
+        if DRY_RUN:
+            print(f"[DRY RUN] Would clear content filtering for network {network_id}. No update sent.")
+            return current_settings
         
         print(f"--- Clearing content filtering for network {network_id} ---")
         
@@ -59,22 +93,233 @@ def clear_content_filtering(network_id, backup=True):
         print(f"Message: {e.message}")
         return None
 
-def confirm_action():
+def remove_content_filtering(network_id, remove_data, backup=True):
+    """
+    Removes only the listed URL patterns and categories for a given network.
+    Skips the update if none of them are currently configured.
+    """
+    try:
+        current_settings = backup_current_settings(network_id, backup)
+        if current_settings is None:
+            return None
+        
+        settings, changes = merge_content_filtering(current_settings, remove=remove_data)
+        if not has_changes(changes):
+            print(f"✓ Nothing to remove for network {network_id}. No update sent.")
+            return current_settings
+        
+        for key, change in changes.items():
+            if change["removed"]:
+                print(f"  {'[DRY RUN] Would remove' if DRY_RUN else 'Removing'} {len(change['removed'])} from {key}")
+        
+        if DRY_RUN:
+            print(f"[DRY RUN] No update sent for network {network_id}.")
+            return current_settings
+        
+        response = dashboard.appliance.updateNetworkApplianceContentFiltering(network_id, **settings)
+        print(f"✓ Content filtering updated successfully for network {network_id}.")
+        return response
+        
+    except meraki.APIError as e:
+        print(f"✗ Error updating content filtering for network {network_id}: {e}")
+        print(f"Status code: {e.status}")
+        print(f"Reason: {e.reason}")
+        print(f"Message: {e.message}")
+        return None
+
+def display_bulk_results(results, controller):
+    """
+    Print a (network_id, name, ok, message) result table and totals.
+    """
+    print(f"\n{'Network':<24} {'Name':<30} Result")
+    for network_id, name, ok, message in results:
+        print(f"{network_id:<24} {name[:30]:<30} {'✓' if ok else '✗'} {message}")
+    
+    succeeded = sum(1 for r in results if r[2])
+    print(f"\n✓ Succeeded: {succeeded}   ✗ Failed: {len(results) - succeeded}")
+    print(controller.format_stats())
+
+def clear_content_filtering_bulk(networks, remove_data=None):
+    """
+    Back up every network into one snapshot file, then clear them all.
+    With remove_data, only the listed patterns/categories are removed
+    instead (see merge_content_filtering).
+    Both phases run concurrently under the adaptive rate controller.
+    Networks whose backup failed are not changed, and networks with
+    nothing to clear or remove are skipped. Returns the snapshot filename
+    (None in dry run mode, where nothing is saved or changed).
+    """
+    controller = AdaptiveConcurrencyController(name="content filtering", maximum=MAX_CONCURRENCY)
+    
+    # Phase 1: concurrent pre-backups into a single snapshot
+    print(f"\n--- Backing up {len(networks)} networks ---")
+    
+    def fetch(network):
+        network_id, _ = network
+        return write_dashboard.appliance.getNetworkApplianceContentFiltering(network_id)
+    
+    cleared = {key: [] for key in CONTENT_FILTERING_LISTS}
+    snapshot = {"createdAt": datetime.now().isoformat(), "networks": {}}
+    to_update = []  # (network_id, name, new settings, result message)
+    results = []
+    for (network_id, name), current, error in controller.map(fetch, networks):
+        if error is not None:
+            results.append((network_id, name, False, f"Backup failed, not changed: {error}"))
+            continue
+        snapshot["networks"][network_id] = {"name": name, "contentFiltering": current}
+        if remove_data is not None:
+            settings, changes = merge_content_filtering(current, remove=remove_data)
+            if has_changes(changes):
+                removed = sum(len(change["removed"]) for change in changes.values())
+                to_update.append((network_id, name, settings, f"Removed {removed} entries"))
+            else:
+                results.append((network_id, name, True, "Nothing to remove (skipped)"))
+        elif any(current.get(key) for key in CONTENT_FILTERING_LISTS):
+            to_update.append((network_id, name, cleared, "Cleared"))
+        else:
+            results.append((network_id, name, True, "Already clear (skipped)"))
+    
+    if DRY_RUN:
+        results.extend(
+            (network_id, name, True, f"[DRY RUN] Would be: {message}") for network_id, name, _, message in to_update
+        )
+        display_bulk_results(results, controller)
+        print("\n⚠️  DRY RUN MODE - No snapshot was saved and no networks were changed")
+        return None
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    snapshot_filename = f"content_filtering_snapshot_{timestamp}.json"
+    with open(snapshot_filename, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+    print(f"✓ Snapshot of {len(snapshot['networks'])} networks saved to: {snapshot_filename}")
+    
+    # Phase 2: concurrent updates
+    print(f"\n--- {'Updating' if remove_data is not None else 'Clearing'} {len(to_update)} networks ---")
+    
+    def update(item):
+        network_id, _, settings, _ = item
+        return write_dashboard.appliance.updateNetworkApplianceContentFiltering(network_id, **settings)
+    
+    for (network_id, name, _, message), _, error in controller.map(update, to_update):
+        results.append((network_id, name, error is None, message if error is None else str(error)))
+    
+    display_bulk_results(results, controller)
+    print(f"\nTo undo, set RESTORE_SNAPSHOT_FILE = \"{snapshot_filename}\" and run again.")
+    return snapshot_filename
+
+def load_snapshot(snapshot_filename):
+    """
+    Load a bulk snapshot written by clear_content_filtering_bulk.
     """
-    Asks user to confirm before clearing settings.
+    with open(snapshot_filename, 'r') as f:
+        return json.load(f)
+
+def restore_content_filtering_snapshot(snapshot):
+    """
+    Restore every network in a bulk snapshot concurrently.
+    In dry run mode only lists what each network would be restored to.
+    """
+    networks = [(network_id, entry["name"]) for network_id, entry in snapshot["networks"].items()]
+    
+    if DRY_RUN:
+        print(f"\n--- [DRY RUN] Would restore {len(networks)} networks ---")
+        for network_id, name in networks:
+            settings = snapshot["networks"][network_id]["contentFiltering"]
+            counts = ", ".join(f"{len(settings.get(key) or [])} {key}" for key in CONTENT_FILTERING_LISTS)
+            print(f"  {network_id:<24} {name[:30]:<30} {counts}")
+        print("\n⚠️  DRY RUN MODE - No actual changes were made")
+        return []
+    
+    print(f"\n--- Restoring {len(networks)} networks ---")
+    controller = AdaptiveConcurrencyController(name="content filtering", maximum=MAX_CONCURRENCY)
+    
+    def restore(network):
+        network_id, _ = network
+        settings = snapshot["networks"][network_id]["contentFiltering"]
+        return write_dashboard.appliance.updateNetworkApplianceContentFiltering(
+            network_id,
+            allowedUrlPatterns=settings.get("allowedUrlPatterns", []),
+            blockedUrlCategories=category_ids(settings.get("blockedUrlCategories", [])),
+            blockedUrlPatterns=settings.get("blockedUrlPatterns", [])
+        )
+    
+    results = [
+        (network_id, name, error is None, "Restored" if error is None else str(error))
+        for (network_id, name), _, error in controller.map(restore, networks)
+    ]
+    display_bulk_results(results, controller)
+    return results
+
+def confirm_action(network_count=1, action="CLEAR ALL"):
+    """
+    Asks user to confirm before clearing (or overwriting) settings.
     """
     print("=" * 60)
-    print("WARNING: This will CLEAR ALL content filtering settings!")
+    if network_count > 1:
+        print(f"WARNING: This will {action} content filtering settings on {network_count} networks!")
+    else:
+        print(f"WARNING: This will {action} content filtering settings!")
     print("=" * 60)
     response = input("\nAre you sure you want to proceed? (yes/no): ").strip().lower()
     return response in ['yes', 'y']
 
-if __name__ == "__main__":
-    if not NETWORK_ID:
+def main():
+    """
+    Clear, partially remove or restore content filtering as configured above.
+    """
+    if RESTORE_SNAPSHOT_FILE:
+        # Put back everything from a bulk snapshot
+        try:
+            snapshot = load_snapshot(RESTORE_SNAPSHOT_FILE)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Error: Could not load {RESTORE_SNAPSHOT_FILE}: {e}")
+        else:
+            print(f"Snapshot {RESTORE_SNAPSHOT_FILE} from {snapshot.get('createdAt', 'unknown time')}")
+            if DRY_RUN or confirm_action(len(snapshot["networks"]), action="OVERWRITE"):
+                restore_content_filtering_snapshot(snapshot)
+            else:
+                print("Operation cancelled.")
+    elif NETWORK_IDS or NETWORK_TAG or ALL_APPLIANCE_NETWORKS:
+        # Clear (or remove the listed entries from) many networks with a single confirmation
+        remove_data = None
+        if REMOVE_CONFIG_FILE:
+            try:
+                with open(REMOVE_CONFIG_FILE, 'r') as f:
+                    remove_data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                print(f"Error: Could not load {REMOVE_CONFIG_FILE}: {e}")
+                return
+        
+        networks = get_target_networks(
+            dashboard, NETWORK_IDS, ORGANIZATION_ID, NETWORK_TAG, ALL_APPLIANCE_NETWORKS
+        )
+        action = "CLEAR ALL" if remove_data is None else "REMOVE LISTED"
+        if not networks:
+            print("No target networks found. Exiting.")
+        elif DRY_RUN or confirm_action(len(networks), action=action):
+            clear_content_filtering_bulk(networks, remove_data)
+        else:
+            print("Operation cancelled.")
+    elif not NETWORK_ID:
         print("Error: Please set the NETWORK_ID in the script.")
+    elif REMOVE_CONFIG_FILE:
+        # Remove only the listed entries
+        try:
+            with open(REMOVE_CONFIG_FILE, 'r') as f:
+                remove_data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Error: Could not load {REMOVE_CONFIG_FILE}: {e}")
+        else:
+            if DRY_RUN or confirm_action(action="REMOVE LISTED"):
+                remove_content_filtering(NETWORK_ID, remove_data, backup=not DRY_RUN)
+            else:
+                print("Operation cancelled.")
     else:
-        # Ask for confirmation before clearing
-        if confirm_action():
-            clear_content_filtering(NETWORK_ID, backup=True)
+        # Ask for confirmation before clearing (a dry run changes nothing)
+        if DRY_RUN or confirm_action():
+            clear_content_filtering(NETWORK_ID, backup=not DRY_RUN)
         else:
-            print("Operation cancelled.")
\ No newline at end of file
+            print("Operation cancelled.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
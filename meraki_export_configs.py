@@ -2,15 +2,25 @@ import meraki
 import json
 import os
 from datetime import datetime
+from meraki_concurrency import AdaptiveConcurrencyController
+from meraki_export_tables import display_table_counts, insert_network_config, open_database
+from meraki_session import get_dashboard
 
 # --- Configuration ---
 ORGANIZATION_ID = ""  # Specify your org ID
 OUTPUT_DIR = "meraki_backups"  # Directory to save backup files
 INCLUDE_DEVICES = True  # Include device-level configs
 INCLUDE_CLIENTS = False  # Include current client lists (can be large)
+INCLUDE_SWITCH_PORTS = False  # Include per-switch port configs (fetched org-wide in bulk)
+SWITCH_PORTS_PER_PAGE = 50  # Switches per page for the org-wide port listing (max 50)
+MAX_CONCURRENCY = 10  # Upper bound for parallel per-switch calls in the fallback path
+EXPORT_SQLITE = False  # Also flatten VLANs, L3 rules, SSIDs, devices and port forwards into export.db
 
 # Initialize the Meraki Dashboard API
-dashboard = meraki.DashboardAPI(suppress_logging=True)
+dashboard = get_dashboard()
+
+# Per-switch fallback calls run under the adaptive controller, which handles 429s itself
+read_dashboard = get_dashboard(wait_on_rate_limit=False, concurrency=MAX_CONCURRENCY)
 
 def get_organization_id():
     """
@@ -30,9 +40,66 @@ def get_organization_id():
         print(f"Error retrieving organizations: {e}")
         return None
 
-def export_network_config(network_id, network_name, output_dir):
+def get_switch_ports_bulk(org_id):
+    """
+    Fetch port configs for every switch in the organization with the
+    org-wide ports-by-switch listing (up to SWITCH_PORTS_PER_PAGE switches
+    per request). Returns {network_id: {serial: ports}}.
+    """
+    switches = dashboard.switch.getOrganizationSwitchPortsBySwitch(
+        org_id, perPage=SWITCH_PORTS_PER_PAGE, total_pages='all'
+    )
+    ports_by_network = {}
+    for switch in switches:
+        network_id = (switch.get("network") or {}).get("id")
+        ports_by_network.setdefault(network_id, {})[switch["serial"]] = switch.get("ports", [])
+    return ports_by_network
+
+def get_switch_ports_per_device(org_id):
+    """
+    Fetch port configs one switch at a time, concurrently.
+    Used when the org-wide listing is not available.
+    Returns {network_id: {serial: ports}}.
+    """
+    switches = dashboard.organizations.getOrganizationDevices(org_id, productTypes=["switch"], total_pages='all')
+    controller = AdaptiveConcurrencyController(name="switch ports", maximum=MAX_CONCURRENCY)
+    
+    def fetch(switch):
+        return read_dashboard.switch.getDeviceSwitchPorts(switch["serial"])
+    
+    ports_by_network = {}
+    for switch, ports, error in controller.map(fetch, switches):
+        if error is not None:
+            print(f"    Warning: Could not get ports for {switch['serial']}: {error}")
+            continue
+        ports_by_network.setdefault(switch.get("networkId"), {})[switch["serial"]] = ports
+    print(f"  {controller.format_stats()}")
+    return ports_by_network
+
+def get_switch_ports(org_id):
+    """
+    Collect port configs for all switches, preferring the bulk endpoint.
+    """
+    print("\nExporting switch ports...")
+    try:
+        ports_by_network = get_switch_ports_bulk(org_id)
+    except (meraki.APIError, AttributeError) as e:
+        print(f"  Org-wide port listing unavailable ({e}), falling back to per-switch calls")
+        try:
+            ports_by_network = get_switch_ports_per_device(org_id)
+        except meraki.APIError as e:
+            print(f"  ✗ Error exporting switch ports: {e}")
+            return {}
+    
+    switch_count = sum(len(switches) for switches in ports_by_network.values())
+    print(f"  ✓ Ports for {switch_count} switches")
+    return ports_by_network
+
+def export_network_config(network_id, network_name, output_dir, switch_ports=None):
     """
     Export comprehensive configuration for a single network.
+    switch_ports is this network's {serial: ports} from get_switch_ports.
+    Returns the exported config, or None if the export failed.
     """
     print(f"  Exporting: {network_name}")
     config = {
@@ -75,12 +142,9 @@ def export_network_config(network_id, network_name, output_dir):
                 # Switch settings
                 config["switches"]["settings"] = dashboard.switch.getNetworkSwitchSettings(network_id)
                 
-                # Switch ports (if you want per-switch port configs)
-                # This can be slow for large networks - uncomment if needed
-                # config["switches"]["ports"] = {}
-                # switches = dashboard.devices.getNetworkDevices(network_id)
-                # for switch in [s for s in switches if s.get('model', '').startswith('MS')]:
-                #     config["switches"]["ports"][switch['serial']] = dashboard.switch.getDeviceSwitchPorts(switch['serial'])
+                # Switch ports, collected org-wide up front (INCLUDE_SWITCH_PORTS)
+                if switch_ports is not None:
+                    config["switches"]["ports"] = switch_ports
                 
                 # Access policies
                 try:
@@ -155,11 +219,11 @@ def export_network_config(network_id, network_name, output_dir):
             json.dump(config, f, indent=2)
         
         print(f"    ✓ Saved to: {filename}")
-        return True
+        return config
         
     except Exception as e:
         print(f"    ✗ Error exporting {network_name}: {e}")
-        return False
+        return None
 
 def export_organization_overview(org_id, output_dir):
     """
@@ -234,15 +298,30 @@ def main():
         networks = dashboard.organizations.getOrganizationNetworks(org_id)
         print(f"\nFound {len(networks)} networks to export\n")
         
+        # Switch ports for the whole org in a handful of requests
+        ports_by_network = get_switch_ports(org_id) if INCLUDE_SWITCH_PORTS else None
+        
+        # Flattened tables for fleet-wide queries
+        db_file = os.path.join(output_dir, "export.db")
+        conn = open_database(db_file) if EXPORT_SQLITE else None
+        
         success_count = 0
         failed_count = 0
         
         for network in networks:
-            if export_network_config(network['id'], network['name'], output_dir):
+            switch_ports = ports_by_network.get(network['id'], {}) if ports_by_network is not None else None
+            config = export_network_config(network['id'], network['name'], output_dir, switch_ports)
+            if config:
                 success_count += 1
+                if conn:
+                    with conn:
+                        insert_network_config(conn, org_id, network['id'], config)
             else:
                 failed_count += 1
         
+        if conn:
+            conn.close()
+        
         # Summary
         print("\n" + "=" * 70)
         print("Export Complete!")
@@ -251,6 +330,9 @@ def main():
         if failed_count > 0:
             print(f"Failed exports: {failed_count} networks")
         print(f"\nAll files saved to: {output_dir}")
+        if EXPORT_SQLITE:
+            print(f"\nTables saved to: {db_file}")
+            display_table_counts(db_file)
         
         # Create a summary file
         summary = {
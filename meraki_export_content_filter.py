@@ -1,122 +1,222 @@
 import meraki
+import hashlib
 import json
+import time
+from datetime import datetime
+from meraki_concurrency import AdaptiveConcurrencyController
+from meraki_url_patterns import category_ids, display_optimization_report, optimize_content_filtering
+from meraki_networks import get_appliance_networks
+from meraki_session import get_dashboard
 
 # --- Configuration ---
 NETWORK_ID = ""  # Network to export content filtering from
 OUTPUT_FILE = "contentFilteringoutput.json"
+OPTIMIZE_PATTERNS = False  # Write normalized, deduplicated URL patterns instead of the raw lists
+
+# Org-wide export (overrides NETWORK_ID when set)
+ORGANIZATION_ID = ""  # Export every appliance network in this organization
+NETWORK_TAG = ""  # Optional: only networks with this tag
+ORG_OUTPUT_FILE = "contentFilteringOrgExport.json"
+MAX_CONCURRENCY = 10  # Upper bound for parallel reads (adapts to 429s)
+
+# Category names come from the API and are cached on disk between runs
+CATEGORY_CACHE_FILE = "content_filtering_categories.json"
+CATEGORY_CACHE_TTL = 24 * 60 * 60  # Seconds before the cached list is refreshed
+REFRESH_CATEGORIES = False  # Ignore the cache and fetch the category list from the API
 
 # Initialize the Meraki Dashboard API
-dashboard = meraki.DashboardAPI()
+dashboard = get_dashboard()
 
-# Category name mappings
-CATEGORIES = {
-    "meraki:contentFiltering/category/C2": "Arts",
-    "meraki:contentFiltering/category/C4": "Job Search",
-    "meraki:contentFiltering/category/C5": "Shopping",
-    "meraki:contentFiltering/category/C6": "Adult",
-    "meraki:contentFiltering/category/C7": "Games",
-    "meraki:contentFiltering/category/C8": "Sports and Recreation",
-    "meraki:contentFiltering/category/C10": "Society and Culture",
-    "meraki:contentFiltering/category/C11": "Government and Law",
-    "meraki:contentFiltering/category/C12": "Science and Technology",
-    "meraki:contentFiltering/category/C14": "Social Science",
-    "meraki:contentFiltering/category/C16": "Hate Speech",
-    "meraki:contentFiltering/category/C18": "Infrastructure and Content Delivery Networks",
-    "meraki:contentFiltering/category/C22": "Illegal Activities",
-    "meraki:contentFiltering/category/C24": "Online Communities",
-    "meraki:contentFiltering/category/C25": "Filter Avoidance",
-    "meraki:contentFiltering/category/C27": "Advertisements",
-    "meraki:contentFiltering/category/C28": "Online Trading",
-    "meraki:contentFiltering/category/C31": "Lingerie and Swimsuits",
-    "meraki:contentFiltering/category/C34": "Lotteries",
-    "meraki:contentFiltering/category/C36": "Weapons",
-    "meraki:contentFiltering/category/C37": "Web Hosting",
-    "meraki:contentFiltering/category/C44": "Transportation",
-    "meraki:contentFiltering/category/C45": "Real Estate",
-    "meraki:contentFiltering/category/C46": "Travel",
-    "meraki:contentFiltering/category/C47": "Illegal Drugs",
-    "meraki:contentFiltering/category/C49": "Gambling",
-    "meraki:contentFiltering/category/C50": "Hacking",
-    "meraki:contentFiltering/category/C51": "Cheating and Plagiarism",
-    "meraki:contentFiltering/category/C52": "Sex Education",
-    "meraki:contentFiltering/category/C54": "Pornography",
-    "meraki:contentFiltering/category/C55": "Dating",
-    "meraki:contentFiltering/category/C56": "Peer File Transfer",
-    "meraki:contentFiltering/category/C60": "Non-sexual Nudity",
-    "meraki:contentFiltering/category/C64": "Child Abuse Content",
-    "meraki:contentFiltering/category/C68": "Freeware and Shareware",
-    "meraki:contentFiltering/category/C69": "Social Networking",
-    "meraki:contentFiltering/category/C72": "Streaming Video",
-    "meraki:contentFiltering/category/C73": "Streaming Audio",
-    "meraki:contentFiltering/category/C74": "Astrology",
-    "meraki:contentFiltering/category/C75": "Extreme",
-    "meraki:contentFiltering/category/C76": "Fashion",
-    "meraki:contentFiltering/category/C77": "Alcohol",
-    "meraki:contentFiltering/category/C78": "Tobacco",
-    "meraki:contentFiltering/category/C79": "Humor",
-    "meraki:contentFiltering/category/C82": "Digital Postcards",
-    "meraki:contentFiltering/category/C83": "Politics",
-    "meraki:contentFiltering/category/C84": "Illegal Downloads",
-    "meraki:contentFiltering/category/C86": "Religion",
-    "meraki:contentFiltering/category/C87": "Non-governmental Organizations",
-    "meraki:contentFiltering/category/C88": "Auctions",
-    "meraki:contentFiltering/category/C91": "Dynamic and Residential",
-    "meraki:contentFiltering/category/C93": "Entertainment",
-    "meraki:contentFiltering/category/C97": "DIY Projects",
-    "meraki:contentFiltering/category/C98": "Hunting",
-    "meraki:contentFiltering/category/C99": "Military",
-    "meraki:contentFiltering/category/C101": "Paranormal",
-    "meraki:contentFiltering/category/C103": "Not Actionable",
-    "meraki:contentFiltering/category/C104": "Health and Medicine",
-    "meraki:contentFiltering/category/C105": "Recipes and Food",
-    "meraki:contentFiltering/category/C106": "Nature and Conservation",
-    "meraki:contentFiltering/category/C107": "Animals and Pets",
-    "meraki:contentFiltering/category/C108": "Web Cache and Archives",
-    "meraki:contentFiltering/category/C109": "Cannabis",
-    "meraki:contentFiltering/category/C111": "Cryptocurrency",
-    "meraki:contentFiltering/category/C112": "Cryptomining",
-    "meraki:contentFiltering/category/C114": "Dynamic DNS Provider",
-    "meraki:contentFiltering/category/C117": "Museums",
-    "meraki:contentFiltering/category/C119": "Terrorism and Violent Extremism",
-    "meraki:contentFiltering/category/C120": "URL Shorteners",
-    "meraki:contentFiltering/category/C122": "DNS-Tunneling",
-    "meraki:contentFiltering/category/T01": "Malware Sites",
-    "meraki:contentFiltering/category/T02": "Spyware and Adware",
-    "meraki:contentFiltering/category/T03": "Phishing",
-    "meraki:contentFiltering/category/T04": "Botnets",
-    "meraki:contentFiltering/category/T05": "Spam",
-    "meraki:contentFiltering/category/T06": "Exploits",
-    "meraki:contentFiltering/category/T09": "Bogon",
-    "meraki:contentFiltering/category/T11": "Ebanking Fraud",
-    "meraki:contentFiltering/category/T12": "Indicators of Compromise (IOC)",
-    "meraki:contentFiltering/category/T13": "Domain Generated Algorithm",
-    "meraki:contentFiltering/category/T14": "Open HTTP Proxy",
-    "meraki:contentFiltering/category/T15": "Open Mail Relay",
-    "meraki:contentFiltering/category/T16": "TOR exit Nodes",
-    "meraki:contentFiltering/category/T21": "Cryptojacking",
-    "meraki:contentFiltering/category/T22": "Linkshare",
-    "meraki:contentFiltering/category/T23": "Malicious Sites"
-}
+# Org-wide reads run under the adaptive controller, which handles 429s itself
+read_dashboard = get_dashboard(wait_on_rate_limit=False, concurrency=MAX_CONCURRENCY)
 
-if __name__ == "__main__":
-    # Get content filtering settings
-    response = dashboard.appliance.getNetworkApplianceContentFiltering(NETWORK_ID)
+def load_category_cache(cache_file, ttl):
+    """
+    Load cached category names if the cache exists and is newer than ttl seconds.
+    Returns (names, fresh) where names is {} when there is no usable cache.
+    """
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}, False
+    fresh = time.time() - cache.get("fetchedAt", 0) < ttl
+    return cache.get("categories", {}), fresh
+
+def get_category_names(network_id, refresh=False, required=()):
+    """
+    Map category IDs to names, from the on-disk cache while it is fresh,
+    otherwise from the network's category list in the API.
+    If any of the `required` IDs is missing from a fresh cache (e.g. a
+    category added since it was written), the list is fetched once more.
+    Falls back to a stale cache if the API call fails.
+    """
+    names, fresh = load_category_cache(CATEGORY_CACHE_FILE, CATEGORY_CACHE_TTL)
+    missing = {cat_id for cat_id in required if cat_id not in names}
+    if fresh and not refresh and not missing:
+        return names
+    if fresh and not refresh:
+        print(f"{len(missing)} categories not in {CATEGORY_CACHE_FILE}, refreshing it")
+    
+    try:
+        response = dashboard.appliance.getNetworkApplianceContentFilteringCategories(network_id)
+    except meraki.APIError as e:
+        print(f"Warning: could not fetch content filtering categories: {e}")
+        if names:
+            print(f"  Using cached categories from {CATEGORY_CACHE_FILE}")
+        return names
     
-    # Format blocked categories with id and name
+    names = {cat["id"]: cat["name"] for cat in response.get("categories", [])}
+    with open(CATEGORY_CACHE_FILE, 'w') as f:
+        json.dump({"fetchedAt": time.time(), "categories": names}, f, indent=4)
+    return names
+
+def category_name(category):
+    """
+    Name carried by a category entry, if it is an {"id", "name"} object.
+    """
+    return category.get("name") if isinstance(category, dict) else None
+
+def unnamed_category_ids(categories):
+    """
+    IDs of category entries without a name, which need the category list.
+    """
+    return [cat_id for cat, cat_id in zip(categories, category_ids(categories)) if not category_name(cat)]
+
+def format_content_filtering(response, category_names):
+    """
+    Build the export structure from a getNetworkApplianceContentFiltering response.
+    """
+    # Format blocked categories with id and name (entries are IDs or {"id", "name"} objects)
+    categories = response.get('blockedUrlCategories', [])
     blocked_categories = [
-        {"id": cat_id, "name": CATEGORIES.get(cat_id, "Unknown")}
-        for cat_id in response.get('blockedUrlCategories', [])
+        {"id": cat_id, "name": category_name(cat) or category_names.get(cat_id, "Unknown")}
+        for cat, cat_id in zip(categories, category_ids(categories))
     ]
     
-    # Build export structure
-    export_data = {
+    return {
         "blockedUrlCategories": blocked_categories,
         "blockedUrlPatterns": response.get('blockedUrlPatterns', []),
         "allowedUrlPatterns": response.get('allowedUrlPatterns', [])
     }
+
+def policy_hash(policy):
+    """
+    Stable SHA-256 hash of a content filtering policy.
+    List order does not change what the policy does, so lists are sorted.
+    """
+    content = json.dumps({
+        "blockedUrlCategories": sorted(cat["id"] for cat in policy["blockedUrlCategories"]),
+        "blockedUrlPatterns": sorted(policy["blockedUrlPatterns"]),
+        "allowedUrlPatterns": sorted(policy["allowedUrlPatterns"])
+    }, separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def export_organization(org_id, tag="", refresh_categories=False):
+    """
+    Export content filtering for every appliance network in an organization.
+    Networks are fetched concurrently; each distinct policy is stored once
+    under its content hash, and each network points at its policy hash.
+    """
+    networks = get_appliance_networks(dashboard, org_id, tag)
+    print(f"Found {len(networks)} appliance networks")
+    if not networks:
+        return {"organizationId": org_id, "exportedAt": datetime.now().isoformat(),
+                "policies": {}, "networks": {}, "errors": {}}
     
-    # Save to file
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(export_data, f, indent=4)
+    controller = AdaptiveConcurrencyController(name="content filtering export", maximum=MAX_CONCURRENCY)
     
-    print(f"✓ Exported to {OUTPUT_FILE}")
\ No newline at end of file
+    def fetch(network):
+        network_id, _ = network
+        return read_dashboard.appliance.getNetworkApplianceContentFiltering(network_id)
+    
+    # A failed or malformed network goes to errors; it must not discard the rest of the export
+    responses = []
+    errors = {}
+    used_categories = set()
+    for (network_id, name), response, error in controller.map(fetch, networks):
+        if error is None:
+            try:
+                used_categories.update(unnamed_category_ids(response.get('blockedUrlCategories', [])))
+            except (AttributeError, KeyError, TypeError) as e:
+                error = f"Unexpected response: {e!r}"
+        if error is not None:
+            errors[network_id] = {"name": name, "error": str(error)}
+        else:
+            responses.append((network_id, name, response))
+    
+    # The category list is the same for every network, so resolve it once
+    category_names = get_category_names(networks[0][0], refresh_categories, used_categories)
+    
+    policies = {}
+    network_map = {}
+    for network_id, name, response in responses:
+        try:
+            policy = format_content_filtering(response, category_names)
+            digest = policy_hash(policy)
+        except (AttributeError, KeyError, TypeError) as e:
+            errors[network_id] = {"name": name, "error": f"Unexpected response: {e!r}"}
+            continue
+        if digest not in policies:
+            policies[digest] = dict(policy, networks=[])
+        policies[digest]["networks"].append(network_id)
+        network_map[network_id] = {"name": name, "policy": digest}
+    
+    print(controller.format_stats())
+    return {
+        "organizationId": org_id,
+        "exportedAt": datetime.now().isoformat(),
+        "policies": policies,
+        "networks": network_map,
+        "errors": errors
+    }
+
+def display_org_summary(export_data):
+    """
+    Show how many networks share each policy.
+    """
+    policies = export_data["policies"]
+    networks = export_data["networks"]
+    print(f"\n{'Policy':<14} {'Networks':>8} {'Categories':>10} {'Blocked':>8} {'Allowed':>8}")
+    for digest, policy in sorted(policies.items(), key=lambda item: -len(item[1]["networks"])):
+        print(f"{digest[:12]:<14} {len(policy['networks']):>8} {len(policy['blockedUrlCategories']):>10} "
+              f"{len(policy['blockedUrlPatterns']):>8} {len(policy['allowedUrlPatterns']):>8}")
+    print(f"\nNetworks exported: {len(networks)}")
+    print(f"Distinct policies: {len(policies)}")
+    if export_data["errors"]:
+        print(f"✗ Failed networks: {len(export_data['errors'])}")
+
+def main():
+    """
+    Export content filtering for NETWORK_ID, or every network in ORGANIZATION_ID.
+    """
+    if ORGANIZATION_ID:
+        # Export every appliance network in the organization
+        export_data = export_organization(ORGANIZATION_ID, NETWORK_TAG, REFRESH_CATEGORIES)
+        display_org_summary(export_data)
+        
+        with open(ORG_OUTPUT_FILE, 'w') as f:
+            json.dump(export_data, f, indent=4)
+        
+        print(f"✓ Exported to {ORG_OUTPUT_FILE}")
+    else:
+        # Get content filtering settings
+        response = dashboard.appliance.getNetworkApplianceContentFiltering(NETWORK_ID)
+        category_names = get_category_names(
+            NETWORK_ID, REFRESH_CATEGORIES, unnamed_category_ids(response.get('blockedUrlCategories', []))
+        )
+        export_data = format_content_filtering(response, category_names)
+        
+        # Optionally remove (and report) duplicate, subsumed and conflicting patterns
+        if OPTIMIZE_PATTERNS:
+            export_data, report = optimize_content_filtering(export_data)
+            display_optimization_report(report)
+        
+        # Save to file
+        with open(OUTPUT_FILE, 'w') as f:
+            json.dump(export_data, f, indent=4)
+        
+        print(f"✓ Exported to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,183 @@
+import json
+import os
+import sqlite3
+
+# --- Configuration ---
+# Build a database from an existing meraki_export_configs.py export folder
+INPUT_DIR = ""  # e.g. "meraki_backups/20240101_120000"
+SQLITE_FILE = "meraki_export.db"
+
+def join_list(value):
+    """
+    Store list values (tags, product types, allowed IPs) as comma-separated text.
+    """
+    if isinstance(value, list):
+        return ",".join(str(item) for item in value)
+    return value
+
+def as_int(value):
+    """
+    Integer column value; None for blanks and non-numeric values like "any".
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+# Table name -> (path to the rows in a network export, [(column, SQL type, extractor)])
+# Every table also gets org_id and network_id key columns.
+TABLES = {
+    "networks": (None, [
+        ("name", "TEXT", lambda r: r.get("name")),
+        ("product_types", "TEXT", lambda r: join_list(r.get("productTypes"))),
+        ("time_zone", "TEXT", lambda r: r.get("timeZone")),
+        ("tags", "TEXT", lambda r: join_list(r.get("tags")))
+    ]),
+    "vlans": (("appliance", "vlans"), [
+        ("vlan_id", "INTEGER", lambda r: as_int(r.get("id"))),
+        ("name", "TEXT", lambda r: r.get("name")),
+        ("subnet", "TEXT", lambda r: r.get("subnet")),
+        ("appliance_ip", "TEXT", lambda r: r.get("applianceIp")),
+        ("dhcp_handling", "TEXT", lambda r: r.get("dhcpHandling"))
+    ]),
+    "l3_firewall_rules": (("appliance", "l3FirewallRules", "rules"), [
+        ("rule_index", "INTEGER", None),
+        ("comment", "TEXT", lambda r: r.get("comment")),
+        ("policy", "TEXT", lambda r: r.get("policy")),
+        ("protocol", "TEXT", lambda r: r.get("protocol")),
+        ("src_cidr", "TEXT", lambda r: r.get("srcCidr")),
+        ("src_port", "TEXT", lambda r: r.get("srcPort")),
+        ("dest_cidr", "TEXT", lambda r: r.get("destCidr")),
+        ("dest_port", "TEXT", lambda r: r.get("destPort")),
+        ("syslog_enabled", "INTEGER", lambda r: as_int(r.get("syslogEnabled")))
+    ]),
+    "port_forwards": (("appliance", "portForwarding", "rules"), [
+        ("rule_index", "INTEGER", None),
+        ("name", "TEXT", lambda r: r.get("name")),
+        ("protocol", "TEXT", lambda r: r.get("protocol")),
+        ("public_port", "TEXT", lambda r: r.get("publicPort")),
+        ("local_port", "TEXT", lambda r: r.get("localPort")),
+        ("lan_ip", "TEXT", lambda r: r.get("lanIp")),
+        ("uplink", "TEXT", lambda r: r.get("uplink")),
+        ("allowed_ips", "TEXT", lambda r: join_list(r.get("allowedIps")))
+    ]),
+    "ssids": (("ssids",), [
+        ("number", "INTEGER", lambda r: as_int(r.get("number"))),
+        ("name", "TEXT", lambda r: r.get("name")),
+        ("enabled", "INTEGER", lambda r: as_int(r.get("enabled"))),
+        ("auth_mode", "TEXT", lambda r: r.get("authMode")),
+        ("encryption_mode", "TEXT", lambda r: r.get("encryptionMode")),
+        ("ip_assignment_mode", "TEXT", lambda r: r.get("ipAssignmentMode")),
+        ("vlan_id", "INTEGER", lambda r: as_int(r.get("defaultVlanId")))
+    ]),
+    "devices": (("devices",), [
+        ("serial", "TEXT", lambda r: r.get("serial")),
+        ("name", "TEXT", lambda r: r.get("name")),
+        ("model", "TEXT", lambda r: r.get("model")),
+        ("mac", "TEXT", lambda r: r.get("mac")),
+        ("lan_ip", "TEXT", lambda r: r.get("lanIp")),
+        ("firmware", "TEXT", lambda r: r.get("firmware")),
+        ("tags", "TEXT", lambda r: join_list(r.get("tags")))
+    ])
+}
+
+def get_section(config, path):
+    """
+    Follow a key path into a network export; returns a list of row dicts.
+    """
+    if path is None:
+        return [config.get("network_info") or {}]
+    value = config
+    for key in path:
+        if not isinstance(value, dict):
+            return []
+        value = value.get(key)
+    return value if isinstance(value, list) else []
+
+def create_tables(conn):
+    """
+    Create the tables (if needed) with an index on the network key.
+    """
+    for table, (_, columns) in TABLES.items():
+        column_sql = ", ".join(f"{name} {sql_type}" for name, sql_type, _ in columns)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (org_id TEXT, network_id TEXT, {column_sql})")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_network ON {table} (network_id)")
+
+def flatten_network_config(org_id, network_id, config):
+    """
+    Flatten one network export into {table: [row tuples]}.
+    """
+    tables = {}
+    for table, (path, columns) in TABLES.items():
+        rows = []
+        for index, record in enumerate(get_section(config, path)):
+            values = [index if extract is None else extract(record) for _, _, extract in columns]
+            rows.append((org_id, network_id, *values))
+        tables[table] = rows
+    return tables
+
+def insert_network_config(conn, org_id, network_id, config):
+    """
+    Replace a network's rows in every table with its flattened export.
+    """
+    for table, rows in flatten_network_config(org_id, network_id, config).items():
+        conn.execute(f"DELETE FROM {table} WHERE network_id = ?", (network_id,))
+        if rows:
+            placeholders = ", ".join("?" * len(rows[0]))
+            conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+def open_database(filename):
+    """
+    Open (or create) the export database.
+    """
+    conn = sqlite3.connect(filename)
+    create_tables(conn)
+    return conn
+
+def build_from_export_dir(input_dir, filename):
+    """
+    Load every network JSON file from an export folder into the database.
+    Returns the number of networks loaded.
+    """
+    conn = open_database(filename)
+    count = 0
+    with conn:
+        for name in sorted(os.listdir(input_dir)):
+            if not name.endswith(".json") or name.startswith(("organization_overview_", "export_summary")):
+                continue
+            with open(os.path.join(input_dir, name), 'r') as f:
+                config = json.load(f)
+            info = config.get("network_info") or {}
+            if not info.get("id"):
+                continue
+            insert_network_config(conn, info.get("organizationId"), info["id"], config)
+            count += 1
+    conn.close()
+    return count
+
+def display_table_counts(filename):
+    """
+    Print the row count of every table.
+    """
+    conn = sqlite3.connect(filename)
+    for table in TABLES:
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        print(f"  {table:<20} {count:>8} rows")
+    conn.close()
+
+def main():
+    """
+    Build SQLITE_FILE from the export folder in INPUT_DIR.
+    """
+    if not INPUT_DIR:
+        print("Error: Please set INPUT_DIR to an export folder.")
+    else:
+        try:
+            count = build_from_export_dir(INPUT_DIR, SQLITE_FILE)
+            print(f"✓ Loaded {count} networks into {SQLITE_FILE}")
+            display_table_counts(SQLITE_FILE)
+        except FileNotFoundError as e:
+            print(f"✗ Error: {e}")
+
+if __name__ == "__main__":
+    main()
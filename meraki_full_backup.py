@@ -2,6 +2,7 @@ import meraki
 import json
 import os
 from datetime import datetime
+from meraki_session import get_dashboard
 
 # --- Configuration ---
 ORGANIZATION_IDS = []  # Leave empty to backup ALL organizations, or specify: ["org_id_1", "org_id_2"]
@@ -11,7 +12,7 @@ BACKUP_DEVICES = True
 BACKUP_TEMPLATES = True
 
 # Initialize the Meraki Dashboard API
-dashboard = meraki.DashboardAPI(suppress_logging=True)
+dashboard = get_dashboard()
 
 def safe_api_call(func, *args, **kwargs):
     """
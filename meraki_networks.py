@@ -0,0 +1,35 @@
+import meraki
+
+def get_appliance_networks(dashboard, org_id, tag=""):
+    """
+    List the appliance networks in an organization, optionally filtered by tag.
+    Returns a list of (network_id, name) tuples.
+    """
+    networks = dashboard.organizations.getOrganizationNetworks(org_id, total_pages='all')
+    return [
+        (net["id"], net["name"]) for net in networks
+        if "appliance" in net.get("productTypes", [])
+        and (not tag or tag in net.get("tags", []))
+    ]
+
+def get_target_networks(dashboard, network_ids=(), org_id="", tag="", all_networks=False):
+    """
+    Resolve the networks a bulk run targets: an explicit list of network
+    IDs, or the appliance networks of an organization (with a tag, or all
+    of them). Returns a list of (network_id, name) tuples, empty if
+    nothing is selected or the networks cannot be listed.
+    """
+    if network_ids:
+        return [(network_id, network_id) for network_id in network_ids]
+    
+    if not (tag or all_networks):
+        return []
+    if not org_id:
+        print("Error: ORGANIZATION_ID is required for NETWORK_TAG / ALL_APPLIANCE_NETWORKS")
+        return []
+    
+    try:
+        return get_appliance_networks(dashboard, org_id, tag)
+    except meraki.APIError as e:
+        print(f"Error retrieving networks: {e}")
+        return []
@@ -1,14 +1,46 @@
 import meraki
+import ipaddress
 import json
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from meraki_concurrency import AdaptiveConcurrencyController, is_rate_limited
+from policy_object_txt_to_json import aggregate_networks, display_aggregation_summary, is_ndjson_file, load_ndjson
+from meraki_session import get_dashboard
 
 # --- Configuration ---
 ORGANIZATION_ID = ""  # Your Meraki Organization ID
-JSON_FILE = "policy_objects.json"
+ORGANIZATION_IDS = []  # Push to several orgs at once: ["org_id_1", "org_id_2"] (overrides ORGANIZATION_ID)
+ALL_ORGANIZATIONS = False  # Push to every organization this API key can access
+MAX_PARALLEL_ORGS = 10  # Organizations processed at the same time (each has its own rate budget)
+JSON_FILE = "policy_objects.json"  # Also accepts the converter's streamed .ndjson output
+CHANGES_FILE = ""  # Converter changes manifest (e.g. "policy_objects_changes.json") to upload only changed groups (deleted after a clean live run)
 DRY_RUN = True  # Set to False to actually make changes
+SYNC_MODE = False  # Also delete objects that were removed from the JSON file
+MANAGED_GROUP_PREFIX = ""  # e.g. "feed_": in sync mode, groups with this prefix that are no longer in the JSON are deleted
+AGGREGATE_CIDRS = False  # Collapse adjacent/overlapping IPs and CIDRs per group before upload
+BULK_MODE = False  # Create objects through org action batches instead of one call each
+
+# Group size limits
+MAX_OBJECTS_PER_GROUP = 150  # Dashboard limit on objects in one policy object group
+CHUNK_OVERSIZED_GROUPS = True  # Split oversized groups into Group_1, Group_2, ... (False = abort)
+CHUNK_INDEX_FILE = "policy_object_chunks.json"  # Maps each logical group to its chunks
+
+# Action batch settings (used when BULK_MODE = True)
+ACTION_BATCH_SIZE = 100  # Max actions per batch (API limit is 100)
+MAX_PENDING_BATCHES = 5  # Dashboard allows 5 unfinished batches per organization
+BATCH_POLL_INTERVAL = 2  # Seconds between batch status checks
+
+# Concurrency for individual create/update calls (adapts to 429s between these bounds)
+INITIAL_CONCURRENCY = 2
+MAX_CONCURRENCY = 10
 
 # Initialize the Meraki Dashboard API
-dashboard = meraki.DashboardAPI(suppress_logging=True)
+dashboard = get_dashboard()
+
+# Writes run under the adaptive controller, which handles 429s itself
+# (one controller per organization, so size the pool for all of them)
+write_dashboard = get_dashboard(wait_on_rate_limit=False, concurrency=MAX_CONCURRENCY * MAX_PARALLEL_ORGS)
 
 def get_existing_policy_objects(org_id):
     """
@@ -16,24 +48,231 @@ def get_existing_policy_objects(org_id):
     Returns a dict with object names as keys.
     """
     try:
-        objects = dashboard.organizations.getOrganizationPolicyObjects(org_id)
+        objects = dashboard.organizations.getOrganizationPolicyObjects(org_id, total_pages='all')
         return {obj['name']: obj for obj in objects}
     except meraki.APIError as e:
         print(f"Error retrieving policy objects: {e}")
         return {}
 
+def normalize_policy_value(obj_type, value):
+    """
+    Build a normalized (type, value) key for an object.
+    IPs and CIDRs share one namespace (an IP is its /32 or /128),
+    FQDNs are compared case-insensitively without a trailing dot.
+    Returns None if the value cannot be normalized.
+    """
+    value = str(value).strip()
+    if obj_type in ("ip", "cidr"):
+        try:
+            return ("cidr", str(ipaddress.ip_network(value, strict=False)))
+        except ValueError:
+            return None
+    if obj_type == "fqdn":
+        return ("fqdn", value.lower().rstrip("."))
+    return None
+
+def policy_object_key(obj):
+    """
+    Normalized (type, value) key of an existing policy object, or None.
+    """
+    if obj.get("type") == "cidr":
+        return normalize_policy_value("cidr", obj.get("cidr", ""))
+    if obj.get("type") == "fqdn":
+        return normalize_policy_value("fqdn", obj.get("fqdn", ""))
+    return None
+
+def index_policy_objects_by_value(objects):
+    """
+    Index existing policy objects by normalized value.
+    Returns a dict with (type, value) keys. If several objects share a
+    value, the first one is kept (groups prefer the one they already
+    reference, see group_object_keys).
+    """
+    index = {}
+    for obj in objects:
+        key = policy_object_key(obj)
+        if key and key not in index:
+            index[key] = obj
+    return index
+
+def group_object_keys(group, objects_by_id):
+    """
+    Map the normalized values of the objects an existing group references
+    to their object IDs, so a value shared by several objects keeps the
+    object the group already uses.
+    """
+    keys = {}
+    for object_id in (group or {}).get("objectIds", []):
+        obj = objects_by_id.get(object_id)
+        key = policy_object_key(obj) if obj else None
+        if key and key not in keys:
+            keys[key] = object_id
+    return keys
+
+def load_chunk_index(filename):
+    """
+    Load the chunk index from a previous run.
+    Returns a dict of {logical_group: {chunk_name: [value keys]}}.
+    """
+    try:
+        with open(filename, 'r') as f:
+            return json.load(f).get("groups", {})
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        print(f"✗ Warning: Invalid JSON in {filename}, chunks will be reassigned")
+        return {}
+
+def save_chunk_index(filename, index, limit):
+    """
+    Save the chunk index so the next run keeps the same assignments.
+    """
+    with open(filename, 'w') as f:
+        json.dump({"max_objects_per_group": limit, "groups": index}, f, indent=4)
+
+def chunk_oversized_groups(groups_config, index, limit):
+    """
+    Split groups with more than `limit` distinct values into chunks named
+    {group}_1, {group}_2, ...
+    
+    Assignment is stable: values keep the chunk they had in the previous
+    index, removed values leave a gap, and new values fill the first chunk
+    with room (in feed order) before a new chunk is added. Re-runs
+    therefore only change the chunks whose members actually changed.
+    Groups that were chunked before stay chunked.
+    
+    Returns the chunked groups config and the new index.
+    """
+    chunked_config = {}
+    # Keep entries for groups not in this run (e.g. unchanged groups skipped via CHANGES_FILE)
+    new_index = {name: chunks for name, chunks in index.items() if name not in groups_config}
+    
+    for group_name, group_data in groups_config.items():
+        # Distinct values in feed order
+        values = {}
+        for obj in group_data.get("objects", []):
+            key = normalize_policy_value(obj["type"], obj["value"])
+            if key is not None:
+                values.setdefault(f"{key[0]}:{key[1]}", obj)
+        
+        if len(values) <= limit and group_name not in index:
+            chunked_config[group_name] = group_data
+            continue
+        
+        # Keep previous assignments for values that are still present
+        chunks = {
+            chunk_name: [k for k in members if k in values]
+            for chunk_name, members in index.get(group_name, {}).items()
+        }
+        assigned = {k for members in chunks.values() for k in members}
+        next_number = max((int(name.rsplit("_", 1)[1]) for name in chunks), default=0) + 1
+        
+        for key in values:
+            if key in assigned:
+                continue
+            target = next((name for name, members in chunks.items() if len(members) < limit), None)
+            if target is None:
+                target = f"{group_name}_{next_number}"
+                next_number += 1
+                chunks[target] = []
+            chunks[target].append(key)
+        
+        print(f"  ⊙ Group '{group_name}' has {len(values)} objects (limit {limit}), "
+              f"using {len(chunks)} chunks")
+        new_index[group_name] = chunks
+        for chunk_name, members in chunks.items():
+            chunked_config[chunk_name] = {"objects": [values[k] for k in members]}
+    
+    return chunked_config, new_index
+
+def find_oversized_groups(groups_config, limit):
+    """
+    Return {group_name: distinct object count} for groups over the limit.
+    """
+    oversized = {}
+    for group_name, group_data in groups_config.items():
+        keys = {normalize_policy_value(obj["type"], obj["value"]) for obj in group_data.get("objects", [])}
+        keys.discard(None)
+        if len(keys) > limit:
+            oversized[group_name] = len(keys)
+    return oversized
+
+def check_group_sizes(groups_config):
+    """
+    Check groups against MAX_OBJECTS_PER_GROUP.
+    Returns False (after listing them) if groups are over the limit and
+    CHUNK_OVERSIZED_GROUPS is off.
+    """
+    oversized = find_oversized_groups(groups_config, MAX_OBJECTS_PER_GROUP)
+    if oversized and not CHUNK_OVERSIZED_GROUPS:
+        print(f"\n✗ Error: These groups exceed the limit of {MAX_OBJECTS_PER_GROUP} objects:")
+        for group_name, count in oversized.items():
+            print(f"  - {group_name}: {count} objects")
+        print("Set CHUNK_OVERSIZED_GROUPS = True to split them automatically")
+        return False
+    return True
+
+def prepare_groups(groups_config, json_groups=None, dry_run=True):
+    """
+    Enforce the group size limit before any object is created: split
+    oversized (and previously chunked) groups using CHUNK_INDEX_FILE.
+    
+    Outside dry run mode the index is always written back, pruned to the
+    logical groups still in the JSON (json_groups, default: the groups
+    in groups_config), or deleted once no group is chunked any more.
+    
+    Returns the chunked groups config and the unpruned chunk index, whose
+    entries for removed groups let sync mode find their chunks.
+    Raises ValueError if groups are too large and chunking is off.
+    """
+    if json_groups is None:
+        json_groups = set(groups_config)
+    if not check_group_sizes(groups_config):
+        raise ValueError(f"Groups exceed the limit of {MAX_OBJECTS_PER_GROUP} objects")
+    
+    chunk_index = load_chunk_index(CHUNK_INDEX_FILE)
+    if find_oversized_groups(groups_config, MAX_OBJECTS_PER_GROUP) or chunk_index:
+        print("\nSplitting oversized groups:")
+        groups_config, chunk_index = chunk_oversized_groups(groups_config, chunk_index, MAX_OBJECTS_PER_GROUP)
+    
+    # Remember chunk assignments so re-runs only touch changed chunks
+    if not dry_run:
+        live_index = {name: chunks for name, chunks in chunk_index.items() if name in json_groups}
+        if live_index:
+            save_chunk_index(CHUNK_INDEX_FILE, live_index, MAX_OBJECTS_PER_GROUP)
+            print(f"Chunk index saved to: {CHUNK_INDEX_FILE}")
+        elif os.path.exists(CHUNK_INDEX_FILE):
+            os.remove(CHUNK_INDEX_FILE)
+            print(f"No chunked groups left, removed {CHUNK_INDEX_FILE}")
+    
+    return groups_config, chunk_index
+
 def get_existing_policy_object_groups(org_id):
     """
     Get all existing policy object groups in the organization.
     Returns a dict with group names as keys.
     """
     try:
-        groups = dashboard.organizations.getOrganizationPolicyObjectsGroups(org_id)
+        groups = dashboard.organizations.getOrganizationPolicyObjectsGroups(org_id, total_pages='all')
         return {grp['name']: grp for grp in groups}
     except meraki.APIError as e:
         print(f"Error retrieving policy object groups: {e}")
         return {}
 
+def build_policy_object_body(name, obj_type, value):
+    """
+    Build the API body for a policy object.
+    Maps our type names to Meraki API requirements.
+    """
+    if obj_type in ("ip", "cidr"):
+        # Same form as the dedup key: a single IP becomes /32 (or /128) and
+        # host bits are cleared (10.0.0.5/24 -> 10.0.0.0/24)
+        return {"name": name, "category": "network", "type": "cidr",
+                "cidr": str(ipaddress.ip_network(value, strict=False))}
+    elif obj_type == "fqdn":
+        return {"name": name, "category": "network", "type": "fqdn", "fqdn": value}
+    return None
+
 def create_policy_object(org_id, name, obj_type, value, dry_run=True):
     """
     Create a single policy object.
@@ -42,42 +281,112 @@ def create_policy_object(org_id, name, obj_type, value, dry_run=True):
         print(f"  [DRY RUN] Would create object: {name} ({obj_type}: {value})")
         return {"id": f"fake_id_{name}", "name": name}
     
+    body = build_policy_object_body(name, obj_type, value)
+    if body is None:
+        print(f"  ✗ Unknown type: {obj_type}")
+        return None
+    
     try:
-        # Map our type names to Meraki API requirements
-        if obj_type == "ip":
-            response = dashboard.organizations.createOrganizationPolicyObject(
-                org_id,
-                name=name,
-                category="network",
-                type="cidr",
-                cidr=f"{value}/32"  # Single IP becomes /32
-            )
-        elif obj_type == "cidr":
-            response = dashboard.organizations.createOrganizationPolicyObject(
-                org_id,
-                name=name,
-                category="network",
-                type="cidr",
-                cidr=value
-            )
-        elif obj_type == "fqdn":
-            response = dashboard.organizations.createOrganizationPolicyObject(
-                org_id,
-                name=name,
-                category="network",
-                type="fqdn",
-                fqdn=value
-            )
-        else:
-            print(f"  ✗ Unknown type: {obj_type}")
-            return None
-        
+        response = write_dashboard.organizations.createOrganizationPolicyObject(org_id, **body)
         print(f"  ✓ Created object: {name}")
         return response
     except meraki.APIError as e:
+        if is_rate_limited(e):
+            raise  # Let the concurrency controller back off and retry
         print(f"  ✗ Error creating object {name}: {e}")
         return None
 
+def wait_for_action_batch(org_id, batch_id):
+    """
+    Poll an action batch until it completes or fails.
+    Returns the final batch, or None if it could not be retrieved.
+    """
+    while True:
+        try:
+            batch = dashboard.organizations.getOrganizationActionBatch(org_id, batch_id)
+        except meraki.APIError as e:
+            print(f"  ✗ Error checking action batch {batch_id}: {e}")
+            return None
+        status = batch.get("status", {})
+        if status.get("completed") or status.get("failed"):
+            return batch
+        time.sleep(BATCH_POLL_INTERVAL)
+
+def create_policy_objects_batched(org_id, pending, dry_run=True):
+    """
+    Create many policy objects through organization action batches.
+    pending is a list of (name, type, value) tuples.
+    Returns a dict mapping object name to its new ID.
+    """
+    actions = []
+    names = []
+    for name, obj_type, value in pending:
+        body = build_policy_object_body(name, obj_type, value)
+        if body is None:
+            print(f"  ✗ Unknown type for {name}: {obj_type}")
+            continue
+        actions.append({
+            "resource": f"/organizations/{org_id}/policyObjects",
+            "operation": "create",
+            "body": body
+        })
+        names.append(name)
+    
+    chunks = [
+        (names[i:i + ACTION_BATCH_SIZE], actions[i:i + ACTION_BATCH_SIZE])
+        for i in range(0, len(actions), ACTION_BATCH_SIZE)
+    ]
+    
+    if dry_run:
+        print(f"  [DRY RUN] Would create {len(actions)} objects in {len(chunks)} action batches")
+        return {name: f"fake_id_{name}" for name in names}
+    
+    created_ids = {}
+    in_flight = []  # (batch_id, chunk_names)
+    
+    def collect(batch_id, chunk_names):
+        batch = wait_for_action_batch(org_id, batch_id)
+        if batch is None:
+            return
+        status = batch.get("status", {})
+        if status.get("failed"):
+            print(f"  ✗ Action batch {batch_id} failed: {status.get('errors')}")
+            return
+        # Created resources are reported in the same order as the submitted actions
+        resources = status.get("createdResources", [])
+        for name, resource in zip(chunk_names, resources):
+            created_ids[name] = resource["id"]
+        print(f"  ✓ Action batch {batch_id} completed: {len(resources)} objects created")
+    
+    for chunk_names, chunk_actions in chunks:
+        # Respect the per-org limit on unfinished batches
+        if len(in_flight) >= MAX_PENDING_BATCHES:
+            collect(*in_flight.pop(0))
+        try:
+            batch = dashboard.organizations.createOrganizationActionBatch(
+                org_id,
+                actions=chunk_actions,
+                confirmed=True,
+                synchronous=False
+            )
+            in_flight.append((batch["id"], chunk_names))
+            print(f"  → Submitted action batch {batch['id']} ({len(chunk_actions)} objects)")
+        except meraki.APIError as e:
+            print(f"  ✗ Error submitting action batch: {e}")
+    
+    for batch_id, chunk_names in in_flight:
+        collect(batch_id, chunk_names)
+    
+    # Fall back to a single lookup by name if any IDs were not reported
+    missing = [name for name in names if name not in created_ids]
+    if missing:
+        existing = get_existing_policy_objects(org_id)
+        for name in missing:
+            if name in existing:
+                created_ids[name] = existing[name]["id"]
+    
+    return created_ids
+
 def create_policy_object_group(org_id, group_name, object_ids, dry_run=True):
     """
     Create a policy object group with the given objects.
@@ -87,7 +396,7 @@ def create_policy_object_group(org_id, group_name, object_ids, dry_run=True):
         return {"id": f"fake_group_id_{group_name}", "name": group_name}
     
     try:
-        response = dashboard.organizations.createOrganizationPolicyObjectsGroup(
+        response = write_dashboard.organizations.createOrganizationPolicyObjectsGroup(
             org_id,
             name=group_name,
             objectIds=object_ids
@@ -95,6 +404,8 @@ def create_policy_object_group(org_id, group_name, object_ids, dry_run=True):
         print(f"  ✓ Created group: {group_name}")
         return response
     except meraki.APIError as e:
+        if is_rate_limited(e):
+            raise  # Let the concurrency controller back off and retry
         print(f"  ✗ Error creating group {group_name}: {e}")
         return None
 
@@ -107,7 +418,7 @@ def update_policy_object_group(org_id, group_id, object_ids, dry_run=True):
         return True
     
     try:
-        response = dashboard.organizations.updateOrganizationPolicyObjectsGroup(
+        response = write_dashboard.organizations.updateOrganizationPolicyObjectsGroup(
             org_id,
             group_id,
             objectIds=object_ids
@@ -115,17 +426,139 @@ def update_policy_object_group(org_id, group_id, object_ids, dry_run=True):
         print(f"  ✓ Updated group")
         return response
     except meraki.APIError as e:
+        if is_rate_limited(e):
+            raise  # Let the concurrency controller back off and retry
         print(f"  ✗ Error updating group: {e}")
         return None
 
-def process_policy_objects(org_id, groups_config, dry_run=True):
+def delete_policy_object_group(org_id, group, dry_run=True):
+    """
+    Delete a policy object group.
+    """
+    if dry_run:
+        print(f"  [DRY RUN] Would delete group: {group['name']}")
+        return True
+    
+    try:
+        write_dashboard.organizations.deleteOrganizationPolicyObjectsGroup(org_id, group["id"])
+        print(f"  ✓ Deleted group: {group['name']}")
+        return True
+    except meraki.APIError as e:
+        if is_rate_limited(e):
+            raise  # Let the concurrency controller back off and retry
+        print(f"  ✗ Error deleting group {group['name']}: {e}")
+        return None
+
+def delete_policy_object(org_id, obj, dry_run=True):
+    """
+    Delete a single policy object.
+    """
+    if dry_run:
+        print(f"  [DRY RUN] Would delete object: {obj['name']}")
+        return True
+    
+    try:
+        write_dashboard.organizations.deleteOrganizationPolicyObject(org_id, obj["id"])
+        print(f"  ✓ Deleted object: {obj['name']}")
+        return True
+    except meraki.APIError as e:
+        if is_rate_limited(e):
+            raise  # Let the concurrency controller back off and retry
+        print(f"  ✗ Error deleting object {obj['name']}: {e}")
+        return None
+
+def find_removed_groups(existing_groups, json_groups, chunk_index, removed_names=()):
+    """
+    Find groups this script manages that are no longer in the JSON file:
+    groups the converter reported as removed, chunks of logical groups
+    that were removed (from the chunk index) and, if MANAGED_GROUP_PREFIX
+    is set, any other group with that prefix.
+    json_groups holds every logical group name in the file.
+    """
+    live = set(json_groups)
+    removed_chunks = set()
+    for group_name, chunks in chunk_index.items():
+        (live if group_name in json_groups else removed_chunks).update(chunks)
+    
+    removed = []
+    for group_name, group in existing_groups.items():
+        if group_name in live:
+            continue
+        if (group_name in removed_names or group_name in removed_chunks
+                or (MANAGED_GROUP_PREFIX and group_name.startswith(MANAGED_GROUP_PREFIX))):
+            removed.append(group)
+    return removed
+
+def find_orphaned_objects(groups_config, existing_objects, existing_groups, desired_ids,
+                          removed_groups=(), failed_groups=()):
+    """
+    Find objects that belonged to a group from the JSON file (or to a
+    removed managed group) but are no longer wanted by any group.
+    Objects used by groups this script does not manage, or by groups whose
+    update failed (they still reference their old objects), are never
+    treated as orphans.
+    """
+    removed_names = {group["name"] for group in removed_groups}
+    managed_ids = set()
+    other_ids = set()
+    for group_name, group in existing_groups.items():
+        if group_name in failed_groups:
+            other_ids.update(group.get("objectIds", []))
+        elif group_name in groups_config or group_name in removed_names:
+            managed_ids.update(group.get("objectIds", []))
+        else:
+            other_ids.update(group.get("objectIds", []))
+    
+    orphan_ids = managed_ids - desired_ids - other_ids
+    return [obj for obj in existing_objects.values() if obj["id"] in orphan_ids]
+
+def run_writes(controller, func, items, dry_run=True):
+    """
+    Run write calls through the adaptive concurrency controller.
+    In dry run mode the calls are made sequentially to keep output readable.
+    Returns a list of (item, result) tuples.
+    """
+    if dry_run:
+        return [(item, func(item)) for item in items]
+    
+    results = []
+    for item, result, error in controller.map(func, items):
+        if error is not None:
+            print(f"  ✗ Giving up on {item[0]}: {error}")
+        results.append((item, result))
+    return results
+
+def process_policy_objects(org_id, groups_config, dry_run=True, bulk=False, sync=False,
+                           json_groups=None, chunk_index=None, removed_names=()):
     """
     Process all groups and objects from the JSON configuration.
+    With bulk=True, new objects are created through action batches.
+    With sync=True, objects dropped from the JSON are deleted afterwards,
+    along with managed groups that are no longer in it (see
+    find_removed_groups). json_groups lists every logical group in the
+    file when groups_config only holds part of it (e.g. CHANGES_FILE);
+    removed_names are groups the converter reported as removed.
+    Groups whose membership already matches are never updated.
+    
+    groups_config holds logical groups, which are checked against the
+    group size limit and chunked first (see prepare_groups). Pass the
+    chunk_index returned by prepare_groups if that was already done.
     """
+    if json_groups is None:
+        json_groups = set(groups_config)
+    if chunk_index is None:
+        groups_config, chunk_index = prepare_groups(groups_config, json_groups, dry_run)
+    
     print("\n" + "=" * 70)
     print("Step 1: Retrieving existing policy objects and groups")
     print("=" * 70)
     
+    controller = AdaptiveConcurrencyController(
+        name=f"org {org_id}",
+        initial=INITIAL_CONCURRENCY,
+        maximum=MAX_CONCURRENCY
+    )
+    
     existing_objects = get_existing_policy_objects(org_id)
     existing_groups = get_existing_policy_object_groups(org_id)
     
@@ -135,79 +568,276 @@ def process_policy_objects(org_id, groups_config, dry_run=True):
     # Track what we create
     created_objects = 0
     skipped_objects = 0
-    created_groups = 0
-    updated_groups = 0
     
     print("\n" + "=" * 70)
-    print("Step 2: Processing policy objects and groups")
+    print("Step 2: Processing policy objects")
     print("=" * 70)
     
+    # Existing objects are matched by value, so reordered feeds and values
+    # shared between groups reuse the same object
+    objects_by_value = index_policy_objects_by_value(existing_objects.values())
+    objects_by_id = {obj["id"]: obj for obj in existing_objects.values()}
+    used_names = set(existing_objects)
+    
+    # Object keys per group (with the ID of the object the group already
+    # references for that value, if any), and objects that still need to be created
+    group_members = {}
+    pending = []
+    pending_names = {}  # key -> name of the object we will create
+    
     for group_name, group_data in groups_config.items():
         print(f"\n--- Processing Group: {group_name} ---")
         objects = group_data.get("objects", [])
         print(f"Objects to process: {len(objects)}")
         
-        # Create/track object IDs for this group
-        object_ids = []
-        
+        # Dict keys keep feed order with O(1) duplicate checks
+        members = group_members[group_name] = {}
+        referenced = group_object_keys(existing_groups.get(group_name), objects_by_id)
         for idx, obj in enumerate(objects, 1):
-            obj_type = obj["type"]
-            obj_value = obj["value"]
-            obj_name = f"{group_name}_{idx}"
+            key = normalize_policy_value(obj["type"], obj["value"])
+            if key is None:
+                print(f"  ✗ Skipping invalid {obj['type']} value: {obj['value']}")
+                continue
+            if key in members:
+                continue
+            members[key] = referenced.get(key)
             
-            # Check if object already exists
-            if obj_name in existing_objects:
-                print(f"  ⊙ Object already exists: {obj_name}")
-                object_ids.append(existing_objects[obj_name]["id"])
+            # Check if an object with this value already exists
+            if key in referenced:
+                print(f"  ⊙ Object already in group: {objects_by_id[referenced[key]]['name']} ({obj['value']})")
                 skipped_objects += 1
-            else:
-                # Create new object
-                result = create_policy_object(org_id, obj_name, obj_type, obj_value, dry_run)
-                if result:
-                    object_ids.append(result["id"])
-                    created_objects += 1
-                    # Rate limiting - be nice to the API
-                    if not dry_run:
-                        time.sleep(0.2)
-        
+            elif key in objects_by_value:
+                print(f"  ⊙ Object already exists: {objects_by_value[key]['name']} ({obj['value']})")
+                skipped_objects += 1
+            elif key not in pending_names:
+                # Keep the {group}_{idx} naming, but never collide with an existing name
+                obj_name = f"{group_name}_{idx}"
+                suffix = 1
+                while obj_name in used_names:
+                    suffix += 1
+                    obj_name = f"{group_name}_{idx}_{suffix}"
+                used_names.add(obj_name)
+                pending_names[key] = obj_name
+                pending.append((obj_name, obj["type"], obj["value"]))
+    
+    # Create the missing objects
+    object_id_map = {key: obj["id"] for key, obj in objects_by_value.items()}
+    if pending:
+        print(f"\nCreating {len(pending)} new policy objects...")
+        if bulk:
+            created_ids = create_policy_objects_batched(org_id, pending, dry_run)
+        else:
+            results = run_writes(
+                controller,
+                lambda item: create_policy_object(org_id, *item, dry_run),
+                pending,
+                dry_run
+            )
+            created_ids = {item[0]: result["id"] for item, result in results if result}
+        created_objects = len(created_ids)
+        for key, obj_name in pending_names.items():
+            if obj_name in created_ids:
+                object_id_map[key] = created_ids[obj_name]
+    
+    print("\n" + "=" * 70)
+    print("Step 3: Processing policy object groups")
+    print("=" * 70)
+    
+    group_writes = []
+    empty_groups = []
+    unchanged_groups = 0
+    desired_ids = set()
+    for group_name, member_keys in group_members.items():
+        object_ids = [
+            object_id or object_id_map[key] for key, object_id in member_keys.items()
+            if object_id or key in object_id_map
+        ]
+        desired_ids.update(object_ids)
+        if not object_ids:
+            # e.g. a chunk whose values were all removed from the feed
+            if not member_keys and group_name in existing_groups:
+                empty_groups.append(existing_groups[group_name])
+            continue
+        if (group_name in existing_groups
+                and set(object_ids) == set(existing_groups[group_name].get("objectIds", []))):
+            print(f"  ⊙ Group already up to date: {group_name}")
+            unchanged_groups += 1
+            continue
+        group_writes.append((group_name, object_ids))
+    
+    def write_group(item):
+        group_name, object_ids = item
         # Create or update the group
-        if object_ids:
-            if group_name in existing_groups:
-                print(f"\n  Group '{group_name}' already exists, updating...")
-                update_policy_object_group(
-                    org_id, 
-                    existing_groups[group_name]["id"], 
-                    object_ids, 
-                    dry_run
-                )
-                updated_groups += 1
-            else:
-                print(f"\n  Creating new group: {group_name}")
-                create_policy_object_group(org_id, group_name, object_ids, dry_run)
-                created_groups += 1
-                if not dry_run:
-                    time.sleep(0.2)
+        if group_name in existing_groups:
+            print(f"\n  Group '{group_name}' already exists, updating...")
+            return update_policy_object_group(
+                org_id, 
+                existing_groups[group_name]["id"], 
+                object_ids, 
+                dry_run
+            )
+        print(f"\n  Creating new group: {group_name}")
+        return create_policy_object_group(org_id, group_name, object_ids, dry_run)
+    
+    results = run_writes(controller, write_group, group_writes, dry_run)
+    failed_groups = {group_name for (group_name, _), result in results if not result}
+    updated_groups = sum(1 for (group_name, _), result in results if result and group_name in existing_groups)
+    created_groups = sum(1 for (group_name, _), result in results if result and group_name not in existing_groups)
+    
+    # Garbage-collect objects that are no longer in any group (after the
+    # group updates above, so they are no longer referenced)
+    deleted_objects = 0
+    orphans = []
+    if sync:
+        print("\n" + "=" * 70)
+        print("Step 4: Removing orphaned policy objects")
+        print("=" * 70)
+        
+        # Groups that no longer have members (or were removed from the
+        # JSON) go first, so their objects can be deleted
+        removed_groups = find_removed_groups(existing_groups, json_groups, chunk_index, removed_names)
+        if empty_groups or removed_groups:
+            print(f"Found {len(empty_groups)} empty and {len(removed_groups)} removed groups")
+            results = run_writes(
+                controller,
+                lambda group: delete_policy_object_group(org_id, group, dry_run),
+                empty_groups + removed_groups,
+                dry_run
+            )
+            # A group that could not be deleted still references its objects
+            failed_groups.update(group["name"] for group, result in results if not result)
+        
+        if failed_groups:
+            print(f"⚠️  Keeping the objects of {len(failed_groups)} groups that could not be written")
+        orphans = find_orphaned_objects(
+            groups_config, existing_objects, existing_groups, desired_ids, removed_groups, failed_groups
+        )
+        print(f"Found {len(orphans)} orphaned policy objects")
+        results = run_writes(
+            controller,
+            lambda obj: delete_policy_object(org_id, obj, dry_run),
+            orphans,
+            dry_run
+        )
+        deleted_objects = sum(1 for _, result in results if result)
     
     # Summary
     print("\n" + "=" * 70)
     print("Summary")
     print("=" * 70)
     print(f"Policy Objects Created: {created_objects}")
-    print(f"Policy Objects Skipped (already exist): {skipped_objects}")
+    print(f"Policy Objects Reused (value already exists): {skipped_objects}")
     print(f"Policy Object Groups Created: {created_groups}")
     print(f"Policy Object Groups Updated: {updated_groups}")
+    print(f"Policy Object Groups Unchanged: {unchanged_groups}")
+    if sync:
+        print(f"Policy Objects Deleted (orphaned): {deleted_objects}")
+    if not dry_run:
+        print(f"API Throughput: {controller.format_stats()}")
     
     if dry_run:
         print("\n⚠️  DRY RUN MODE - No actual changes were made")
         print("Set DRY_RUN = False to apply changes")
     else:
         print("\n✓ All changes have been applied!")
+    
+    return {
+        "created_objects": created_objects,
+        "reused_objects": skipped_objects,
+        "created_groups": created_groups,
+        "updated_groups": updated_groups,
+        "unchanged_groups": unchanged_groups,
+        "deleted_objects": deleted_objects,
+        "failed_writes": len(pending) - created_objects + len(failed_groups) + len(orphans) - deleted_objects,
+        "api": controller.stats()
+    }
+
+def process_organizations(org_ids, groups_config, dry_run=True, bulk=False, sync=False,
+                          json_groups=None, chunk_index=None, removed_names=()):
+    """
+    Push the same configuration to several organizations concurrently.
+    Each organization gets its own adaptive rate controller, so the run
+    takes about as long as the slowest organization.
+    In dry run mode organizations are processed one at a time.
+    Groups are chunked once up front (see prepare_groups).
+    """
+    if chunk_index is None:
+        groups_config, chunk_index = prepare_groups(groups_config, json_groups, dry_run)
+    
+    def run(org_id):
+        try:
+            summary = process_policy_objects(
+                org_id, groups_config, dry_run, bulk, sync, json_groups, chunk_index, removed_names
+            )
+            return org_id, summary, None
+        except Exception as e:
+            return org_id, None, e
+    
+    if dry_run:
+        results = [run(org_id) for org_id in org_ids]
+    else:
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_ORGS) as executor:
+            results = list(executor.map(run, org_ids))
+    
+    # Per-organization results
+    print("\n" + "=" * 70)
+    print("Results by Organization")
+    print("=" * 70)
+    print(f"{'Organization':<22} {'Created':>8} {'Reused':>8} {'Groups+':>8} {'Groups~':>8} {'Deleted':>8} {'429s':>6}")
+    failed = 0
+    for org_id, summary, error in results:
+        if error is not None:
+            failed += 1
+            print(f"{org_id:<22} ✗ Failed: {error}")
+            continue
+        print(f"{org_id:<22} {summary['created_objects']:>8} {summary['reused_objects']:>8} "
+              f"{summary['created_groups']:>8} {summary['updated_groups']:>8} "
+              f"{summary['deleted_objects']:>8} {summary['api']['rate_limited']:>6}")
+    print(f"\nOrganizations succeeded: {len(results) - failed}")
+    if failed:
+        print(f"Organizations failed: {failed}")
+    
+    return results
+
+def filter_changed_groups(groups_config, changes_file):
+    """
+    Keep only the groups the converter reported as added or changed.
+    Returns the groups and the names of groups reported as removed.
+    """
+    try:
+        with open(changes_file, 'r') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"✗ Warning: Could not read changes manifest {changes_file} ({e}), processing all groups")
+        return groups_config, []
+    
+    wanted = set(manifest.get("added", [])) | set(manifest.get("changed", []))
+    removed = [name for name in manifest.get("removed", []) if name not in groups_config]
+    return {name: data for name, data in groups_config.items() if name in wanted}, removed
+
+def acknowledge_changes(changes_file, summaries):
+    """
+    Delete the changes manifest once every organization applied it without
+    failed writes, so the next conversion reports changes from this upload.
+    Otherwise the manifest is kept and the converter adds to it.
+    """
+    if not os.path.exists(changes_file):
+        return
+    if all(summary and not summary["failed_writes"] for summary in summaries):
+        os.remove(changes_file)
+        print(f"✓ All changes uploaded, removed {changes_file}")
+    else:
+        print(f"⚠️  Some writes failed, keeping {changes_file} for the next run")
 
 def load_json_config(filename):
     """
     Load the policy objects configuration from JSON file.
+    Streamed converter output (.ndjson) is detected from the content,
+    so it loads whatever the file is called.
     """
     try:
+        if is_ndjson_file(filename):
+            return load_ndjson(filename)
         with open(filename, 'r') as f:
             config = json.load(f)
         return config.get("groups", {})
@@ -218,6 +848,21 @@ def load_json_config(filename):
         print(f"✗ Error: Invalid JSON in {filename}")
         return None
 
+def get_target_organization_ids():
+    """
+    Determine which organizations to push to.
+    """
+    if ORGANIZATION_IDS:
+        return ORGANIZATION_IDS
+    if ALL_ORGANIZATIONS:
+        try:
+            return [org['id'] for org in dashboard.organizations.getOrganizations()]
+        except meraki.APIError as e:
+            print(f"Error retrieving organizations: {e}")
+            return []
+    org_id = ORGANIZATION_ID if ORGANIZATION_ID else get_organization_id()
+    return [org_id] if org_id else []
+
 def get_organization_id():
     """
     Automatically get the organization ID if not specified.
@@ -236,20 +881,28 @@ def get_organization_id():
         print(f"Error retrieving organizations: {e}")
         return None
 
-if __name__ == "__main__":
+def main():
+    """
+    Create and update policy objects from JSON_FILE as configured above.
+    """
     print("=" * 70)
     print("Meraki Policy Objects Bulk Updater")
     print("=" * 70)
     
-    # Get organization ID
-    org_id = ORGANIZATION_ID if ORGANIZATION_ID else get_organization_id()
-    if not org_id:
+    # Get organization ID(s)
+    org_ids = get_target_organization_ids()
+    if not org_ids:
         print("✗ Error: Could not determine organization ID")
         exit(1)
     
-    print(f"\nOrganization ID: {org_id}")
+    if len(org_ids) == 1:
+        print(f"\nOrganization ID: {org_ids[0]}")
+    else:
+        print(f"\nOrganizations: {len(org_ids)} ({', '.join(org_ids)})")
     print(f"JSON Config File: {JSON_FILE}")
     print(f"Mode: {'DRY RUN (no changes will be made)' if DRY_RUN else 'LIVE (changes will be applied)'}")
+    print(f"Object Creation: {'Action batches' if BULK_MODE else 'Individual API calls'}")
+    print(f"Sync Mode: {'ON (orphaned objects will be deleted)' if SYNC_MODE else 'OFF'}")
     
     # Load configuration
     groups_config = load_json_config(JSON_FILE)
@@ -257,6 +910,26 @@ if __name__ == "__main__":
         exit(1)
     
     print(f"\nLoaded {len(groups_config)} policy object groups from JSON")
+    json_groups = set(groups_config)
+    
+    removed_names = []
+    if CHANGES_FILE:
+        groups_config, removed_names = filter_changed_groups(groups_config, CHANGES_FILE)
+        print(f"Processing {len(groups_config)} added/changed and {len(removed_names)} removed groups "
+              f"from {CHANGES_FILE}")
+        if removed_names and not SYNC_MODE:
+            print("Note: removed groups are only deleted with SYNC_MODE = True")
+        if not groups_config and not (removed_names and SYNC_MODE):
+            print("✓ Nothing changed, no updates needed")
+            exit(0)
+    
+    if AGGREGATE_CIDRS:
+        groups_config, stats = aggregate_networks(groups_config)
+        display_aggregation_summary(stats)
+    
+    # Validate group sizes before asking for confirmation
+    if not check_group_sizes(groups_config):
+        exit(1)
     
     # Confirm before proceeding in live mode
     if not DRY_RUN:
@@ -266,5 +939,21 @@ if __name__ == "__main__":
             print("Operation cancelled.")
             exit(0)
     
-    # Process everything
-    process_policy_objects(org_id, groups_config, dry_run=DRY_RUN)
\ No newline at end of file
+    # Process everything (oversized groups are chunked first)
+    if len(org_ids) == 1:
+        summaries = [process_policy_objects(
+            org_ids[0], groups_config, dry_run=DRY_RUN, bulk=BULK_MODE, sync=SYNC_MODE,
+            json_groups=json_groups, removed_names=removed_names
+        )]
+    else:
+        results = process_organizations(
+            org_ids, groups_config, dry_run=DRY_RUN, bulk=BULK_MODE, sync=SYNC_MODE,
+            json_groups=json_groups, removed_names=removed_names
+        )
+        summaries = [summary for _, summary, _ in results]
+    
+    if CHANGES_FILE and not DRY_RUN:
+        acknowledge_changes(CHANGES_FILE, summaries)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
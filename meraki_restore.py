@@ -1,6 +1,7 @@
 import meraki
 import json
 import os
+from meraki_session import get_dashboard
 
 # --- Configuration ---
 BACKUP_FILE = ""  # Path to network backup JSON file (e.g., "meraki_backups/.../networks/HQ_L_12345.json")
@@ -15,8 +16,12 @@ RESTORE_GROUP_POLICIES = True
 RESTORE_ALERTS = True
 RESTORE_SYSLOG = True
 
+# How to handle objects that already exist (matched by name) in the target network
+# True = update them in place when they differ, False = always skip them
+UPDATE_EXISTING = True
+
 # Initialize the Meraki Dashboard API
-dashboard = meraki.DashboardAPI(suppress_logging=True)
+dashboard = get_dashboard()
 
 def load_backup(filepath):
     """
@@ -51,6 +56,44 @@ def safe_restore(func, description, dry_run=True, *args, **kwargs):
         print(f"  ✗ Unexpected error restoring {description}: {e}")
         return False
 
+def get_existing_by_name(list_func, network_id, description):
+    """
+    Build a name index of objects that already exist in the target network.
+    Uses a single list call per section.
+    """
+    try:
+        items = list_func(network_id) or []
+        return {item["name"]: item for item in items if item.get("name")}
+    except meraki.APIError as e:
+        print(f"  ✗ Could not list existing {description}: {e}")
+        return {}
+
+def upsert_restore(create_func, update_func, id_field, existing, config, description, dry_run, network_id):
+    """
+    Create an object, or update/skip it if one with the same name already exists.
+    Makes restores safe to re-run after a partial failure.
+    """
+    current = existing.get(config.get("name"))
+    if current is None:
+        return safe_restore(create_func, description, dry_run, network_id, **config)
+    
+    if all(current.get(k) == v for k, v in config.items()):
+        print(f"  ⊙ Already up to date: {description}")
+        return True
+    
+    if not UPDATE_EXISTING:
+        print(f"  ⊙ Already exists, skipping: {description}")
+        return True
+    
+    return safe_restore(
+        update_func,
+        f"{description} (update existing)",
+        dry_run,
+        network_id,
+        current[id_field],
+        **config
+    )
+
 def restore_wireless_settings(network_id, wireless_config, dry_run=True):
     """
     Restore wireless configurations.
@@ -91,17 +134,23 @@ def restore_wireless_settings(network_id, wireless_config, dry_run=True):
     
     # Restore RF profiles
     if wireless_config.get("rfProfiles"):
+        existing_profiles = get_existing_by_name(
+            dashboard.wireless.getNetworkWirelessRfProfiles, network_id, "RF profiles"
+        )
         for profile in wireless_config["rfProfiles"]:
             # Skip default profiles
             if not profile.get("name", "").startswith("Custom"):
                 continue
             profile_config = {k: v for k, v in profile.items() if k not in ["id", "networkId"]}
-            safe_restore(
+            upsert_restore(
                 dashboard.wireless.createNetworkWirelessRfProfile,
+                dashboard.wireless.updateNetworkWirelessRfProfile,
+                "id",
+                existing_profiles,
+                profile_config,
                 f"RF Profile: {profile.get('name')}",
                 dry_run,
-                network_id,
-                **profile_config
+                network_id
             )
 
 def restore_switch_settings(network_id, switch_config, dry_run=True):
@@ -127,26 +176,38 @@ def restore_switch_settings(network_id, switch_config, dry_run=True):
     
     # Restore port schedules
     if switch_config.get("portSchedules"):
+        existing_schedules = get_existing_by_name(
+            dashboard.switch.getNetworkSwitchPortSchedules, network_id, "port schedules"
+        )
         for schedule in switch_config["portSchedules"]:
             schedule_config = {k: v for k, v in schedule.items() if k not in ["id", "networkId"]}
-            safe_restore(
+            upsert_restore(
                 dashboard.switch.createNetworkSwitchPortSchedule,
+                dashboard.switch.updateNetworkSwitchPortSchedule,
+                "id",
+                existing_schedules,
+                schedule_config,
                 f"Port Schedule: {schedule.get('name')}",
                 dry_run,
-                network_id,
-                **schedule_config
+                network_id
             )
     
     # Restore access policies
     if switch_config.get("accessPolicies"):
+        existing_policies = get_existing_by_name(
+            dashboard.switch.getNetworkSwitchAccessPolicies, network_id, "access policies"
+        )
         for policy in switch_config["accessPolicies"]:
             policy_config = {k: v for k, v in policy.items() if k not in ["accessPolicyNumber", "counts"]}
-            safe_restore(
+            upsert_restore(
                 dashboard.switch.createNetworkSwitchAccessPolicy,
+                dashboard.switch.updateNetworkSwitchAccessPolicy,
+                "accessPolicyNumber",
+                existing_policies,
+                policy_config,
                 f"Access Policy: {policy.get('name')}",
                 dry_run,
-                network_id,
-                **policy_config
+                network_id
             )
     
     # Restore QoS rules
@@ -259,14 +320,20 @@ def restore_appliance_settings(network_id, appliance_config, dry_run=True):
     
     # Restore static routes
     if appliance_config.get("staticRoutes"):
+        existing_routes = get_existing_by_name(
+            dashboard.appliance.getNetworkApplianceStaticRoutes, network_id, "static routes"
+        )
         for route in appliance_config["staticRoutes"]:
             route_config = {k: v for k, v in route.items() if k not in ["id", "networkId"]}
-            safe_restore(
+            upsert_restore(
                 dashboard.appliance.createNetworkApplianceStaticRoute,
+                dashboard.appliance.updateNetworkApplianceStaticRoute,
+                "id",
+                existing_routes,
+                route_config,
                 f"Static Route: {route.get('name')}",
                 dry_run,
-                network_id,
-                **route_config
+                network_id
             )
     
     # Restore site-to-site VPN
@@ -322,14 +389,21 @@ def restore_group_policies(network_id, policies, dry_run=True):
     
     print("\n--- Restoring Group Policies ---")
     
+    existing_policies = get_existing_by_name(
+        dashboard.networks.getNetworkGroupPolicies, network_id, "group policies"
+    )
+    
     for policy in policies:
         policy_config = {k: v for k, v in policy.items() if k not in ["groupPolicyId"]}
-        safe_restore(
+        upsert_restore(
             dashboard.networks.createNetworkGroupPolicy,
+            dashboard.networks.updateNetworkGroupPolicy,
+            "groupPolicyId",
+            existing_policies,
+            policy_config,
             f"Group Policy: {policy.get('name')}",
             dry_run,
-            network_id,
-            **policy_config
+            network_id
         )
 
 def restore_alerts(network_id, alerts, dry_run=True):
@@ -0,0 +1,98 @@
+import threading
+
+# --- Default Settings ---
+MAX_CONCURRENCY = 10  # Connection pool size (keep-alive connections per host)
+SINGLE_REQUEST_TIMEOUT = 60  # Seconds before a single request times out
+MAXIMUM_RETRIES = 3  # SDK retries for 429s and 5xx errors
+NGINX_429_RETRY_WAIT_TIME = 2  # Seconds to wait on a 429 without a Retry-After header
+RETRY_4XX_ERROR = False  # Retry other 4xx errors (usually bad input, so off)
+LOG_API_CALLS = False  # SDK log files and console output (writes a log file per run)
+
+# One client per configuration, shared by everything that imports this module
+_clients = {}
+
+class LazyDashboard:
+    """
+    Stands in for a DashboardAPI client and builds it on first use.
+    
+    Scripts create their clients at import time; with this, importing a
+    script only imports the SDK (for meraki.APIError), and building the
+    client and reading the API key wait until the first API call.
+    """
+    
+    def __init__(self, build):
+        self._build = build
+        self._client = None
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._build()
+        return getattr(self._client, name)
+
+def _size_connection_pool(client, concurrency):
+    """
+    Size the SDK's requests session pool so concurrent calls reuse
+    keep-alive connections instead of opening (and discarding) new ones.
+    """
+    session = getattr(getattr(client, "_session", None), "_req_session", None)
+    if session is None:
+        return
+    from requests.adapters import HTTPAdapter
+    
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("https://", adapter)
+
+def _base_settings():
+    """
+    DashboardAPI arguments shared by the sync and async clients.
+    """
+    return {
+        "single_request_timeout": SINGLE_REQUEST_TIMEOUT,
+        "maximum_retries": MAXIMUM_RETRIES,
+        "nginx_429_retry_wait_time": NGINX_429_RETRY_WAIT_TIME,
+        "retry_4xx_error": RETRY_4XX_ERROR,
+        "suppress_logging": not LOG_API_CALLS,
+        "print_console": LOG_API_CALLS,
+        "output_log": LOG_API_CALLS
+    }
+
+def get_dashboard(wait_on_rate_limit=True, concurrency=MAX_CONCURRENCY, **overrides):
+    """
+    Return a shared, tuned Dashboard API client (built on first use).
+    
+    wait_on_rate_limit=False is for calls made under an
+    AdaptiveConcurrencyController, which handles 429s itself. Any other
+    DashboardAPI argument can be passed as an override.
+    """
+    key = (wait_on_rate_limit, concurrency, tuple(sorted(overrides.items())))
+    if key not in _clients:
+        def build():
+            import meraki
+            
+            settings = _base_settings()
+            settings["wait_on_rate_limit"] = wait_on_rate_limit
+            settings.update(overrides)
+            client = meraki.DashboardAPI(**settings)
+            _size_connection_pool(client, concurrency)
+            return client
+        
+        _clients[key] = LazyDashboard(build)
+    return _clients[key]
+
+def get_async_dashboard(concurrency=MAX_CONCURRENCY, **overrides):
+    """
+    Create an asyncio Dashboard API client with the same settings.
+    Use it as an async context manager:
+        
+        async with get_async_dashboard() as aiomeraki:
+            networks = await aiomeraki.organizations.getOrganizationNetworks(org_id)
+    """
+    import meraki.aio
+    
+    settings = _base_settings()
+    settings["maximum_concurrent_requests"] = concurrency
+    settings.update(overrides)
+    return meraki.aio.AsyncDashboardAPI(**settings)
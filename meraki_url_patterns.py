@@ -0,0 +1,276 @@
+import re
+
+# --- Settings ---
+# Meraki matches a plain domain pattern ("example.com") against the domain
+# and all of its subdomains, "*.example.com" against subdomains only, and a
+# path ("example.com/news") against URLs whose path starts with it.
+DOMAIN_MATCHES_SUBDOMAINS = True
+
+_SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*://')
+
+def normalize_pattern(pattern):
+    """
+    Normalize a URL pattern: strip the scheme, lowercase the host, drop
+    trailing dots and slashes. Returns None for empty patterns.
+    """
+    pattern = _SCHEME_RE.sub('', str(pattern).strip())
+    host, slash, path = pattern.partition('/')
+    host = host.lower().rstrip('.')
+    path = path.rstrip('/')
+    if not host:
+        return None
+    return f"{host}/{path}" if path else host
+
+def parse_pattern(pattern):
+    """
+    Split a normalized pattern into (reversed host labels, wildcard, path).
+    """
+    host, _, path = pattern.partition('/')
+    wildcard = host.startswith('*.')
+    if wildcard:
+        host = host[2:]
+    return host.split('.')[::-1], wildcard, path
+
+def path_covers(outer, inner):
+    """
+    Check if path `outer` matches every URL path `inner` matches.
+    """
+    return not outer or inner == outer or inner.startswith(outer + '/')
+
+def parse_url(url):
+    """
+    Split a URL into (reversed host labels, path) for matching.
+    Scheme, credentials, port, query string and fragment are dropped.
+    """
+    url = _SCHEME_RE.sub('', url.strip())
+    host, _, path = url.partition('/')
+    host = host.rpartition('@')[2].partition(':')[0].lower().rstrip('.')
+    path = path.partition('?')[0].partition('#')[0].rstrip('/')
+    return host.split('.')[::-1], path
+
+class PatternTrie:
+    """
+    Reversed-domain trie of URL patterns.
+    example.com is stored under com -> example; each node keeps the
+    patterns for that host as (path, wildcard, value) entries.
+    """
+    
+    def __init__(self):
+        self.root = [{}, []]
+    
+    def add(self, pattern, value):
+        labels, wildcard, path = parse_pattern(pattern)
+        node = self.root
+        for label in labels:
+            node = node[0].setdefault(label, [{}, []])
+        node[1].append((path, wildcard, value))
+    
+    def find_cover(self, pattern):
+        """
+        Return the value of a stored pattern that matches everything
+        `pattern` matches, or None.
+        """
+        labels, wildcard, path = parse_pattern(pattern)
+        node = self.root
+        for depth, label in enumerate(labels):
+            node = node[0].get(label)
+            if node is None:
+                return None
+            below = depth < len(labels) - 1
+            for entry_path, entry_wildcard, value in node[1]:
+                if not path_covers(entry_path, path):
+                    continue
+                if below and (entry_wildcard or DOMAIN_MATCHES_SUBDOMAINS):
+                    # An ancestor domain pattern covers this host
+                    return value
+                if not below and (entry_wildcard == wildcard
+                                  or (not entry_wildcard and DOMAIN_MATCHES_SUBDOMAINS)):
+                    # Same host: plain covers wildcard, otherwise kinds must match
+                    return value
+        return None
+    
+    def matches(self, url):
+        """
+        Yield (depth, value) for every stored pattern that matches a URL.
+        Depth is the number of host labels the pattern spans, so a larger
+        depth is a more specific match.
+        """
+        labels, path = parse_url(url)
+        node = self.root
+        for depth, label in enumerate(labels, 1):
+            node = node[0].get(label)
+            if node is None:
+                return
+            below = depth < len(labels)
+            for entry_path, entry_wildcard, value in node[1]:
+                if below:
+                    applies = entry_wildcard or DOMAIN_MATCHES_SUBDOMAINS
+                else:
+                    applies = not entry_wildcard
+                if applies and path_covers(entry_path, path):
+                    yield depth, value
+
+def optimize_patterns(patterns):
+    """
+    Normalize a pattern list, remove duplicates and patterns subsumed by
+    broader ones. Order of the kept patterns is preserved.
+    
+    Patterns are inserted into the trie from the broadest (fewest labels,
+    shortest path) to the most specific, so each pattern only has to look
+    up the path from the root to its own host.
+    
+    Returns (kept_patterns, removed) where removed is a list of
+    (original_pattern, reason, covering_pattern).
+    """
+    normalized = []
+    removed = []
+    seen = {}
+    for original in patterns:
+        pattern = normalize_pattern(original)
+        if pattern is None:
+            removed.append((original, "empty", None))
+        elif pattern in seen:
+            removed.append((original, "duplicate", seen[pattern]))
+        else:
+            seen[pattern] = original
+            normalized.append(pattern)
+    
+    def breadth(pattern):
+        labels, wildcard, path = parse_pattern(pattern)
+        # Plain domains before wildcards on the same host (plain covers wildcard)
+        return (len(labels), wildcard, len(path))
+    
+    trie = PatternTrie()
+    subsumed = set()
+    for pattern in sorted(normalized, key=breadth):
+        cover = trie.find_cover(pattern)
+        if cover is not None:
+            subsumed.add(pattern)
+            removed.append((seen[pattern], "subsumed", cover))
+        else:
+            trie.add(pattern, pattern)
+    
+    kept = [pattern for pattern in normalized if pattern not in subsumed]
+    return kept, removed
+
+def find_conflicts(allowed, blocked):
+    """
+    Find blocked patterns that an allowed pattern fully overrides (allow
+    lists take precedence, so these block entries never take effect).
+    Returns a list of (blocked_pattern, allowed_pattern).
+    """
+    trie = PatternTrie()
+    for pattern in allowed:
+        normalized = normalize_pattern(pattern)
+        if normalized:
+            trie.add(normalized, pattern)
+    
+    conflicts = []
+    for pattern in blocked:
+        normalized = normalize_pattern(pattern)
+        if normalized:
+            cover = trie.find_cover(normalized)
+            if cover is not None:
+                conflicts.append((pattern, cover))
+    return conflicts
+
+def optimize_content_filtering(config):
+    """
+    Optimize the allowed and blocked URL pattern lists of a content
+    filtering config. Returns the new config and a report dict.
+    """
+    allowed, removed_allowed = optimize_patterns(config.get("allowedUrlPatterns", []))
+    blocked, removed_blocked = optimize_patterns(config.get("blockedUrlPatterns", []))
+    
+    optimized = dict(config, allowedUrlPatterns=allowed, blockedUrlPatterns=blocked)
+    report = {
+        "allowedRemoved": removed_allowed,
+        "blockedRemoved": removed_blocked,
+        "conflicts": find_conflicts(allowed, blocked),
+        "allowedBefore": len(config.get("allowedUrlPatterns", [])),
+        "blockedBefore": len(config.get("blockedUrlPatterns", [])),
+        "allowedAfter": len(allowed),
+        "blockedAfter": len(blocked)
+    }
+    return optimized, report
+
+def display_optimization_report(report, examples=5):
+    """
+    Print a summary of what the optimizer removed and flagged.
+    """
+    print("\nURL pattern optimization:")
+    for label, key in (("Allowed", "allowed"), ("Blocked", "blocked")):
+        removed = report[f"{key}Removed"]
+        print(f"  {label} URL Patterns: {report[f'{key}Before']} → {report[f'{key}After']}")
+        for original, reason, cover in removed[:examples]:
+            suffix = f" (by {cover})" if cover else ""
+            print(f"    - {original}: {reason}{suffix}")
+        if len(removed) > examples:
+            print(f"    ... and {len(removed) - examples} more")
+    
+    conflicts = report["conflicts"]
+    if conflicts:
+        print(f"  ⚠️  {len(conflicts)} blocked patterns are overridden by allowed patterns:")
+        for blocked, allowed in conflicts[:examples]:
+            print(f"    - {blocked} (allowed by {allowed})")
+        if len(conflicts) > examples:
+            print(f"    ... and {len(conflicts) - examples} more")
+
+CONTENT_FILTERING_LISTS = ("allowedUrlPatterns", "blockedUrlPatterns", "blockedUrlCategories")
+
+def category_ids(categories):
+    """
+    Category lists come back as {"id", "name"} objects or plain ID strings.
+    """
+    return [cat["id"] if isinstance(cat, dict) else cat for cat in categories]
+
+def merge_content_filtering(current, add=None, remove=None):
+    """
+    Apply add/remove sets to the current content filtering lists.
+    Patterns are compared in normalized form, so "https://Example.com/"
+    removes "example.com" and is not added next to it.
+    
+    Returns (settings, changes) where settings holds the three lists for
+    updateNetworkApplianceContentFiltering and changes maps each list to
+    {"added": [...], "removed": [...]}. If nothing was added or removed,
+    the lists are exactly the current ones and the update can be skipped.
+    """
+    add = add or {}
+    remove = remove or {}
+    settings = {}
+    changes = {}
+    
+    for key in CONTENT_FILTERING_LISTS:
+        if key == "blockedUrlCategories":
+            items = category_ids(current.get(key, []))
+            to_add = category_ids(add.get(key, []))
+            to_remove = category_ids(remove.get(key, []))
+            normalize = str
+        else:
+            items = list(current.get(key, []))
+            to_add = add.get(key, [])
+            to_remove = remove.get(key, [])
+            normalize = normalize_pattern
+        
+        remove_keys = {normalize(item) for item in to_remove}
+        kept = [item for item in items if normalize(item) not in remove_keys]
+        removed = [item for item in items if normalize(item) in remove_keys]
+        
+        present = {normalize(item) for item in kept}
+        added = []
+        for item in to_add:
+            item_key = normalize(item)
+            if item_key and item_key not in present and item_key not in remove_keys:
+                present.add(item_key)
+                added.append(item)
+        
+        settings[key] = kept + added
+        changes[key] = {"added": added, "removed": removed}
+    
+    return settings, changes
+
+def has_changes(changes):
+    """
+    Check if a merge added or removed anything.
+    """
+    return any(change["added"] or change["removed"] for change in changes.values())
@@ -0,0 +1,232 @@
+import ipaddress
+import json
+import re
+from policy_object_txt_to_json import is_ndjson_file, load_ndjson, parse_text_file
+
+# --- Configuration ---
+INPUT_FILE = "policy_objects.json"  # Converter output (.json / .ndjson) or a raw feed (.txt)
+REPORT_FILE = "policy_object_overlaps.json"
+EXAMPLES_TO_SHOW = 10  # Findings printed per category
+
+# Plain IPv4 address or CIDR, parsed without ipaddress on the fast path
+_IPV4_OCTET = r'(25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+_IPV4_NETWORK_RE = re.compile(rf'{_IPV4_OCTET}\.{_IPV4_OCTET}\.{_IPV4_OCTET}\.{_IPV4_OCTET}(?:/(3[0-2]|[12]?[0-9]))?')
+
+def load_groups(filename):
+    """
+    Load policy object groups from converter output or a raw text feed.
+    """
+    if is_ndjson_file(filename):
+        return load_ndjson(filename)
+    if filename.endswith(".json"):
+        with open(filename, 'r') as f:
+            return json.load(f).get("groups", {})
+    return parse_text_file(filename)
+
+def flatten_entries(groups):
+    """
+    Flatten groups into a list of (group, type, value) entries.
+    """
+    return [
+        (group_name, obj["type"], obj["value"])
+        for group_name, group_data in groups.items()
+        for obj in group_data.get("objects", [])
+    ]
+
+def parse_network(value):
+    """
+    Parse an IP or CIDR into (version, prefixlen, network_int, max_prefixlen).
+    Host bits are cleared like ipaddress.ip_network(strict=False).
+    Returns None if the value is not a valid address or network.
+    """
+    match = _IPV4_NETWORK_RE.fullmatch(value.strip())
+    if match:
+        a, b, c, d, prefix = match.groups()
+        prefixlen = int(prefix) if prefix is not None else 32
+        address = (int(a) << 24) | (int(b) << 16) | (int(c) << 8) | int(d)
+        return 4, prefixlen, address >> (32 - prefixlen) << (32 - prefixlen), 32
+    try:
+        net = ipaddress.ip_network(value.strip(), strict=False)
+    except ValueError:
+        return None
+    return net.version, net.prefixlen, int(net.network_address), net.max_prefixlen
+
+def find_ip_overlaps(entries):
+    """
+    Find duplicate and covered IP/CIDR entries with a level-compressed
+    binary radix trie.
+    
+    Each level of the trie (one per prefix length that actually occurs)
+    is a dict from the prefix bits to the first entry with that prefix;
+    levels with no prefixes are skipped entirely, so a /32 or /128 only
+    visits the handful of prefix lengths present in the feed instead of
+    walking 32 or 128 single-bit nodes.
+    
+    Entries are inserted from the shortest prefix to the longest, so every
+    network that could cover an entry is already indexed when the entry is
+    looked up. Returns a list of (entry_index, kind, other_index) where
+    kind is "duplicate" or "covered" and other_index is the first entry
+    with the same value, or the most specific entry covering it.
+    """
+    networks = []
+    for idx, (_, obj_type, value) in enumerate(entries):
+        if obj_type not in ("ip", "cidr"):
+            continue
+        net = parse_network(value)
+        if net is not None:
+            networks.append((idx, net))
+    networks.sort(key=lambda item: item[1][1])
+    
+    # {version: {prefixlen: {prefix_bits: entry_index}}}, levels in ascending order
+    levels = {4: {}, 6: {}}
+    findings = []
+    
+    for idx, (version, entry_prefixlen, address, width) in networks:
+        trie = levels[version]
+        cover = None
+        
+        for prefixlen, prefixes in trie.items():
+            if prefixlen >= entry_prefixlen:
+                break
+            match = prefixes.get(address >> (width - prefixlen))
+            if match is not None:
+                cover = match
+        
+        level = trie.setdefault(entry_prefixlen, {})
+        key = address >> (width - entry_prefixlen)
+        if key in level:
+            findings.append((idx, "duplicate", level[key]))
+        else:
+            level[key] = idx
+            if cover is not None:
+                findings.append((idx, "covered", cover))
+    
+    return findings
+
+def find_fqdn_overlaps(entries):
+    """
+    Find duplicate and covered FQDN entries with a reversed-label trie.
+    
+    "a.example.com" is stored under com -> example -> a. A wildcard
+    "*.example.com" is stored on the example.com node and covers every
+    name (and wildcard) strictly below it, but not example.com itself.
+    Entries are inserted from the fewest labels to the most, so covering
+    wildcards are always found on the way down.
+    """
+    names = []
+    for idx, (_, obj_type, value) in enumerate(entries):
+        if obj_type != "fqdn":
+            continue
+        name = value.strip().lower().rstrip(".")
+        wildcard = name.startswith("*.")
+        if wildcard:
+            name = name[2:]
+        if name:
+            names.append((idx, wildcard, name.split(".")[::-1]))
+    names.sort(key=lambda item: len(item[2]))
+    
+    # Trie nodes are [children, exact_entry_indexes, wildcard_entry_indexes]
+    root = [{}, None, None]
+    findings = []
+    
+    for idx, wildcard, labels in names:
+        node = root
+        cover = None
+        for label in labels:
+            if node[2] is not None:
+                cover = node[2][0]
+            child = node[0].get(label)
+            if child is None:
+                child = node[0][label] = [{}, None, None]
+            node = child
+        
+        slot = 2 if wildcard else 1
+        if node[slot] is not None:
+            findings.append((idx, "duplicate", node[slot][0]))
+            node[slot].append(idx)
+        else:
+            node[slot] = [idx]
+            if cover is not None:
+                findings.append((idx, "covered", cover))
+    
+    return findings
+
+def analyze_overlaps(groups):
+    """
+    Run both tries over all groups.
+    Returns a list of finding dicts sorted in input order.
+    """
+    entries = flatten_entries(groups)
+    findings = find_ip_overlaps(entries) + find_fqdn_overlaps(entries)
+    findings.sort()
+    
+    report = []
+    for idx, kind, other in findings:
+        group_name, obj_type, value = entries[idx]
+        other_group, _, other_value = entries[other]
+        report.append({
+            "kind": kind,
+            "group": group_name,
+            "type": obj_type,
+            "value": value,
+            "matchedGroup": other_group,
+            "matchedValue": other_value,
+            "crossGroup": group_name != other_group
+        })
+    return report, len(entries)
+
+def display_overlap_summary(report, total_entries):
+    """
+    Display counts and a few examples per category.
+    """
+    print("\n" + "=" * 70)
+    print("Overlap Summary")
+    print("=" * 70)
+    
+    categories = [
+        ("Exact duplicates (same group)", "duplicate", False),
+        ("Exact duplicates (across groups)", "duplicate", True),
+        ("Covered entries (same group)", "covered", False),
+        ("Covered entries (across groups)", "covered", True)
+    ]
+    for title, kind, cross in categories:
+        matches = [f for f in report if f["kind"] == kind and f["crossGroup"] == cross]
+        print(f"\n{title}: {len(matches)}")
+        for finding in matches[:EXAMPLES_TO_SHOW]:
+            relation = "same as" if kind == "duplicate" else "inside"
+            print(f"  - {finding['group']}: {finding['value']} {relation} "
+                  f"{finding['matchedGroup']}: {finding['matchedValue']}")
+        if len(matches) > EXAMPLES_TO_SHOW:
+            print(f"  ... and {len(matches) - EXAMPLES_TO_SHOW} more")
+    
+    print("\n" + "=" * 70)
+    print(f"Total Entries: {total_entries}")
+    print(f"Redundant Entries: {len(report)}")
+    print("=" * 70)
+
+def main():
+    """
+    Write the overlap report for INPUT_FILE.
+    """
+    print("=" * 70)
+    print("Policy Object Overlap Report")
+    print("=" * 70)
+    
+    try:
+        print(f"\nReading from: {INPUT_FILE}")
+        groups = load_groups(INPUT_FILE)
+        
+        report, total_entries = analyze_overlaps(groups)
+        display_overlap_summary(report, total_entries)
+        
+        with open(REPORT_FILE, 'w') as f:
+            json.dump({"totalEntries": total_entries, "findings": report}, f, indent=2)
+        print(f"\n✓ Report saved to: {REPORT_FILE}")
+    
+    except FileNotFoundError:
+        print(f"\n✗ Error: File '{INPUT_FILE}' not found.")
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,48 @@
+import csv
+import hashlib
 import json
 import ipaddress
+import itertools
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
 
 # --- Configuration ---
 INPUT_FILE = "policy_objects.txt"
-OUTPUT_FILE = "policy_objects.json"
+INPUT_FORMAT = "auto"  # "auto" (detected from the content), "text", "csv", "hosts" or "ioc"
+EXTRA_INPUTS = []  # More feeds merged in the same pass, e.g. [("blocklist.csv", "csv"), ("hosts", "hosts")]
+OUTPUT_FILE = ""  # Defaults to policy_objects.json, or policy_objects.ndjson for OUTPUT_FORMAT = "ndjson"
+AGGREGATE_CIDRS = False  # Collapse adjacent/overlapping IPs and CIDRs into the fewest CIDRs
+OUTPUT_FORMAT = "json"  # "json" or "ndjson" (streams one object per line, constant memory)
+INCREMENTAL = False  # Reuse the previous output for groups whose source is unchanged and write a changes manifest
+CHANGES_FILE = "policy_objects_changes.json"  # Changed-groups manifest written in incremental mode
+WORKERS = 1  # Processes for JSON conversion (1 = single process, 0 = one per CPU core)
+MIN_PARALLEL_SIZE = 64 * 1024 * 1024  # Files smaller than this (bytes) are converted in one process
 
-def detect_type(value):
+# CSV columns (matched case-insensitively, first match wins)
+CSV_VALUE_COLUMNS = ["value", "indicator", "ioc", "ip", "domain", "fqdn", "cidr", "address"]
+CSV_GROUP_COLUMNS = ["group", "group_name", "list", "category"]
+
+# Hosts-file names that are never blocklist entries
+HOSTS_IGNORE = {
+    "localhost", "localhost.localdomain", "local", "broadcasthost", "0.0.0.0",
+    "ip6-localhost", "ip6-loopback", "ip6-localnet", "ip6-mcastprefix",
+    "ip6-allnodes", "ip6-allrouters", "ip6-allhosts"
+}
+
+# Precompiled patterns for the detect_type fast path
+_IPV4_OCTET = r'(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+_IPV4_RE = re.compile(rf'{_IPV4_OCTET}(?:\.{_IPV4_OCTET}){{3}}')
+_IPV4_CIDR_RE = re.compile(rf'{_IPV4_OCTET}(?:\.{_IPV4_OCTET}){{3}}/(?:3[0-2]|[12]?[0-9])')
+_IPV4_CHARS_RE = re.compile(r'[0-9./]+')
+
+def _detect_type_slow(value):
     """
-    Automatically detect if value is IP, CIDR, or FQDN.
+    Classify a value with ipaddress validation.
+    Used for values the fast path in detect_type cannot decide.
     """
-    value = value.strip()
-    
     # Try to parse as IP address
     try:
         ipaddress.ip_address(value)
@@ -26,17 +57,36 @@ def detect_type(value):
     except ValueError:
         pass
     
-    # Check if it looks like a valid FQDN/domain pattern
-    # Allows wildcards, domains, subdomains
-    if re.match(r'^(\*\.)?([a-zA-Z0-9-]+\.)*[a-zA-Z0-9-]+\.[a-zA-Z]{2,}$', value):
-        return "fqdn"
+    # Anything else (domains, wildcards, ...) is treated as FQDN
+    return "fqdn"
+
+def detect_type(value):
+    """
+    Automatically detect if value is IP, CIDR, or FQDN.
+    """
+    value = value.strip()
     
-    # If it contains wildcard but didn't match above pattern, still treat as FQDN
-    if '*' in value or '?' in value:
+    # IPv6 (and anything else with a colon) needs full validation
+    if ':' in value:
+        return _detect_type_slow(value)
+    
+    # Without a colon, only digits, dots and slashes can form an IP or CIDR
+    if not _IPV4_CHARS_RE.fullmatch(value):
         return "fqdn"
     
-    # Default to FQDN for anything else (safer assumption)
-    return "fqdn"
+    if _IPV4_RE.fullmatch(value):
+        return "ip"
+    if _IPV4_CIDR_RE.fullmatch(value):
+        return "cidr"
+    
+    # Unusual forms (netmask notation, leading zeros, ...)
+    return _detect_type_slow(value)
+
+def detect_types(values):
+    """
+    Classify many values at once (detect_type for each value).
+    """
+    return [detect_type(value) for value in values]
 
 def parse_text_file(filename):
     """
@@ -59,7 +109,61 @@ def parse_text_file(filename):
     10.0.0.0/8
     *.example.com
     """
+    return group_records(iter_records(filename))
+
+def group_records(records):
+    """
+    Collect (group, type, value) records into the
+    {group_name: {"objects": [...]}} structure.
+    """
     groups = {}
+    
+    for group_name, value_type, value in records:
+        if group_name not in groups:
+            groups[group_name] = {"objects": []}
+        if value_type is None:
+            continue
+        groups[group_name]["objects"].append({
+            "type": value_type,
+            "value": value
+        })
+    
+    return groups
+
+def parse_group_header(line):
+    """
+    Return the group name if a (stripped) line is a group header, else None.
+    
+    [Group.Name] is always a header (so names may contain dots), unless
+    the bracketed text is an address such as [::1]. Otherwise a line is a
+    header if it doesn't look like IP/FQDN/CIDR: group names shouldn't
+    contain dots, slashes, or wildcards.
+    """
+    if len(line) > 2 and line.startswith('[') and line.endswith(']'):
+        name = line[1:-1].strip()
+        if name and detect_type(name) == "fqdn":
+            return name
+    if not any(char in line for char in ['.', '/', '*', ':']):
+        return line
+    return None
+
+def strip_brackets(value):
+    """
+    Remove the brackets around a bracketed address ("[2001:db8::1]" -> "2001:db8::1"),
+    so it is classified as an IP instead of an FQDN.
+    """
+    if len(value) > 2 and value.startswith('[') and value.endswith(']'):
+        return value[1:-1].strip()
+    return value
+
+def iter_records(filename, classify=detect_type):
+    """
+    Stream (group, type, value) records from a text file in the
+    parse_text_file format, one line at a time.
+    A record with type and value None marks a group header, so empty
+    groups are still seen by consumers.
+    classify(value) gives the record type (detect_type by default).
+    """
     current_group = None
     
     with open(filename, 'r') as f:
@@ -70,13 +174,11 @@ def parse_text_file(filename):
             if not line or line.startswith('#'):
                 continue
             
-            # Check if this line is a group name (doesn't look like IP/FQDN/CIDR)
-            # Group names shouldn't contain dots, slashes, or wildcards
-            if not any(char in line for char in ['.', '/', '*', ':']):
+            header = parse_group_header(line)
+            if header is not None:
                 # This is a new group name
-                current_group = line
-                if current_group not in groups:
-                    groups[current_group] = {"objects": []}
+                current_group = header
+                yield current_group, None, None
                 continue
             
             # This is a value (IP, CIDR, or FQDN)
@@ -84,15 +186,458 @@ def parse_text_file(filename):
                 print(f"Warning: Line {line_num} has value '{line}' but no group defined. Skipping.")
                 continue
             
-            # Detect type and add to current group
-            value_type = detect_type(line)
-            groups[current_group]["objects"].append({
-                "type": value_type,
-                "value": line
-            })
+            # Detect type and emit
+            value = strip_brackets(line)
+            yield current_group, classify(value), value
+
+def clean_indicator(value):
+    """
+    Turn a vendor indicator into a plain IP/CIDR/domain.
+    Re-fangs defanged values (hxxp, [.], [dot], ...) and reduces URLs to
+    their host. Returns None for values that are not network indicators
+    (file hashes, email addresses).
+    """
+    value = value.strip().strip('"\'')
+    if not value:
+        return None
+    
+    # Re-fang
+    value = re.sub(r'^hxxp', 'http', value, flags=re.IGNORECASE)
+    for defanged, plain in (("[.]", "."), ("(.)", "."), ("[dot]", "."), ("[:]", ":")):
+        value = value.replace(defanged, plain)
+    value = strip_brackets(value)
+    
+    # URLs become their host
+    if "://" in value:
+        try:
+            value = urlsplit(value).hostname or ""
+        except ValueError:
+            return None
+    
+    # File hashes and email addresses are not policy objects
+    if re.fullmatch(r'[0-9a-fA-F]{32}|[0-9a-fA-F]{40}|[0-9a-fA-F]{64}', value) or "@" in value:
+        return None
+    
+    return value.rstrip(".") or None
+
+def default_group_name(filename):
+    """
+    Group name for formats without group headers: the file name without extension.
+    """
+    return os.path.splitext(os.path.basename(filename))[0]
+
+def iter_csv_records(filename, group=None, classify=detect_type):
+    """
+    Stream records from a CSV export with a header row.
+    The value column is the first of CSV_VALUE_COLUMNS found; if one of
+    CSV_GROUP_COLUMNS exists it sets the group, otherwise `group` (or the
+    file name) is used.
+    """
+    default_group = group or default_group_name(filename)
+    
+    with open(filename, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in (reader.fieldnames or [])}
+        value_column = next((columns[c] for c in CSV_VALUE_COLUMNS if c in columns), None)
+        group_column = next((columns[c] for c in CSV_GROUP_COLUMNS if c in columns), None)
+        if value_column is None:
+            print(f"Warning: No value column found in {filename} (expected one of {CSV_VALUE_COLUMNS}). Skipping.")
+            return
+        
+        for row in reader:
+            value = clean_indicator(row.get(value_column) or "")
+            if value is None:
+                continue
+            group_name = (row.get(group_column) or "").strip() if group_column else ""
+            yield group_name or default_group, classify(value), value
+
+def iter_hosts_records(filename, group=None, classify=detect_type):
+    """
+    Stream records from a hosts-file blocklist ("0.0.0.0 bad.example.com").
+    Every hostname on a line becomes an FQDN object; the address is ignored.
+    """
+    group_name = group or default_group_name(filename)
+    
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            for host in line.split()[1:]:
+                host = host.lower().rstrip(".")
+                if host and host not in HOSTS_IGNORE:
+                    yield group_name, classify(host), host
+
+def iter_ioc_records(filename, group=None, classify=detect_type):
+    """
+    Stream records from a plain indicator list, one value per line.
+    Comments (# or ;) are skipped, defanged values and URLs are cleaned,
+    and non-network indicators such as hashes are dropped.
+    """
+    group_name = group or default_group_name(filename)
+    
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(('#', ';')):
+                continue
+            value = clean_indicator(line)
+            if value is not None:
+                yield group_name, classify(value), value
+
+# Streaming readers by input format; each yields (group, type, value) records
+READERS = {
+    "text": lambda filename, group=None, classify=detect_type: iter_records(filename, classify),
+    "csv": iter_csv_records,
+    "hosts": iter_hosts_records,
+    "ioc": iter_ioc_records
+}
+
+def detect_input_format(filename):
+    """
+    Guess the input format from the first line that is not blank or a comment:
+    - a header row with one of CSV_VALUE_COLUMNS (or a .csv file): csv
+    - an address followed by host names: hosts
+    - a group header: text (values before the first header are skipped there)
+    - anything else, e.g. a bare indicator: ioc
+    """
+    if filename.lower().endswith(".csv"):
+        return "csv"
+    
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(('#', ';')):
+                continue
+            if ',' in line and any(column.strip().strip('"').lower() in CSV_VALUE_COLUMNS
+                                   for column in line.split(',')):
+                return "csv"
+            parts = line.split()
+            if len(parts) > 1 and detect_type(parts[0]) == "ip":
+                return "hosts"
+            if clean_indicator(line) is not None and parse_group_header(line) is not None:
+                return "text"
+            return "ioc"
+    return "text"
+
+def iter_feed_records(filename, input_format="auto", group=None, classify=detect_type):
+    """
+    Stream records from a feed in any supported format.
+    """
+    if input_format == "auto":
+        input_format = detect_input_format(filename)
+    if input_format not in READERS:
+        raise ValueError(f"Unknown input format '{input_format}' (expected one of {', '.join(READERS)})")
+    return READERS[input_format](filename, group, classify)
+
+def iter_all_inputs(classify=detect_type):
+    """
+    Stream records from INPUT_FILE followed by every EXTRA_INPUTS feed.
+    """
+    return itertools.chain(
+        iter_feed_records(INPUT_FILE, INPUT_FORMAT, classify=classify),
+        *(iter_feed_records(filename, input_format, classify=classify) for filename, input_format in EXTRA_INPUTS)
+    )
+
+def _find_chunk_boundaries(filename, chunk_count):
+    """
+    Split a file into roughly equal byte ranges that start at line starts.
+    """
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, chunk_count):
+            newline = mm.find(b'\n', max(size * i // chunk_count, boundaries[-1]))
+            if newline == -1:
+                break
+            if newline + 1 > boundaries[-1]:
+                boundaries.append(newline + 1)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def _parse_byte_range(task):
+    """
+    Parse one byte range of the input in a worker process.
+    Returns a list of (group, values) segments in file order; a leading
+    segment with group None holds values that continue the group from the
+    previous range.
+    """
+    filename, start, end = task
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode('utf-8')
+    
+    segments = [(None, [])]
+    for line in text.split('\n'):
+        line = line.strip()
+        
+        # Skip empty lines and comments
+        if not line or line.startswith('#'):
+            continue
+        
+        header = parse_group_header(line)
+        if header is not None:
+            segments.append((header, []))
+        else:
+            segments[-1][1].append(strip_brackets(line))
+    
+    return [
+        (group_name, [{"type": t, "value": v} for t, v in zip(detect_types(values), values)])
+        for group_name, values in segments
+    ]
+
+def parse_text_file_parallel(filename, workers=None):
+    """
+    Parse a large text file using several processes.
+    The file is split into line-aligned byte ranges that are read through
+    mmap and classified in a process pool. Results are merged in file
+    order, so the output is identical to parse_text_file.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(filename, start, end) for start, end in _find_chunk_boundaries(filename, workers * 4)]
+    
+    groups = {}
+    current_group = None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for segments in executor.map(_parse_byte_range, tasks):
+            for group_name, objects in segments:
+                if group_name is None:
+                    if current_group is None:
+                        for obj in objects:
+                            print(f"Warning: Value '{obj['value']}' has no group defined. Skipping.")
+                        continue
+                else:
+                    current_group = group_name
+                    if current_group not in groups:
+                        groups[current_group] = {"objects": []}
+                groups[current_group]["objects"].extend(objects)
+    
+    return groups
+
+def generate_ndjson(records, output_file):
+    """
+    Write records to an NDJSON file as they are produced, one
+    {"group", "type", "value"} object per line. Each group is announced
+    once with a group-only {"group"} line, so empty groups are kept.
+    Only per-group counts are kept in memory.
+    Returns {group_name: {type: count}}.
+    """
+    counts = {}
+    
+    with open(output_file, 'w') as f:
+        for group_name, value_type, value in records:
+            if group_name not in counts:
+                counts[group_name] = {}
+                f.write(json.dumps({"group": group_name}) + "\n")
+            type_counts = counts[group_name]
+            if value_type is None:
+                continue
+            type_counts[value_type] = type_counts.get(value_type, 0) + 1
+            f.write(json.dumps({"group": group_name, "type": value_type, "value": value}) + "\n")
+    
+    return counts
+
+def load_ndjson(filename):
+    """
+    Load an NDJSON file written by generate_ndjson into the same
+    {group_name: {"objects": [...]}} structure as parse_text_file.
+    """
+    groups = {}
+    
+    with open(filename, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            objects = groups.setdefault(record["group"], {"objects": []})["objects"]
+            if "type" in record:
+                objects.append({"type": record["type"], "value": record["value"]})
     
     return groups
 
+def is_ndjson_file(filename):
+    """
+    Check if a file holds converter NDJSON output: its first line is a
+    complete JSON object with a "group" key. Regular JSON output starts
+    with a bare "{" line (or is one object with a "groups" key).
+    """
+    with open(filename, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                return False
+            return isinstance(record, dict) and "group" in record
+    return False
+
+def aggregate_group_networks(objects):
+    """
+    Collapse the IP and CIDR objects of one group into the minimal set of
+    covering networks (IPv4 and IPv6 separately). Other objects are kept
+    as-is, in their original order, after the networks.
+    """
+    networks = {4: [], 6: []}
+    others = []
+    for obj in objects:
+        if obj["type"] in ("ip", "cidr"):
+            try:
+                net = ipaddress.ip_network(obj["value"], strict=False)
+            except ValueError:
+                others.append(obj)
+                continue
+            networks[net.version].append(net)
+        else:
+            others.append(obj)
+    
+    aggregated = []
+    for version in (4, 6):
+        for net in ipaddress.collapse_addresses(networks[version]):
+            if net.num_addresses == 1:
+                aggregated.append({"type": "ip", "value": str(net.network_address)})
+            else:
+                aggregated.append({"type": "cidr", "value": str(net)})
+    
+    return aggregated + others
+
+def aggregate_networks(groups):
+    """
+    Apply CIDR aggregation to every group.
+    Returns the new groups and a dict of {group_name: (before, after)} object counts.
+    """
+    aggregated = {}
+    stats = {}
+    for group_name, group_data in groups.items():
+        objects = aggregate_group_networks(group_data["objects"])
+        aggregated[group_name] = dict(group_data, objects=objects)
+        stats[group_name] = (len(group_data["objects"]), len(objects))
+    return aggregated, stats
+
+def display_aggregation_summary(stats):
+    """
+    Display how much CIDR aggregation reduced each group.
+    """
+    print("\nCIDR aggregation:")
+    total_before = total_after = 0
+    for group_name, (before, after) in stats.items():
+        total_before += before
+        total_after += after
+        if before != after:
+            print(f"  {group_name}: {before} → {after} objects")
+    ratio = (1 - total_after / total_before) * 100 if total_before else 0
+    print(f"  Total: {total_before} → {total_after} objects ({ratio:.1f}% reduction)")
+
+def group_content_hash(objects):
+    """
+    Stable SHA-256 hash of a group's objects (type and value, in order).
+    """
+    content = json.dumps([[obj["type"], obj["value"]] for obj in objects], separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def group_source_hash(values, aggregate=False):
+    """
+    Stable SHA-256 hash of a group's source values (before classification
+    and aggregation). The aggregation setting is part of the hash, since it
+    changes the output for the same source.
+    """
+    content = json.dumps([aggregate, values], separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def load_previous_groups(output_file):
+    """
+    Load the groups from a previous JSON output, if there is one.
+    """
+    try:
+        with open(output_file, 'r') as f:
+            return json.load(f).get("groups", {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def convert_incremental(previous_groups, aggregate=False):
+    """
+    Convert the inputs, reusing the previous output for unchanged groups.
+    
+    Values are first collected per group without classification and
+    hashed. Groups whose source hash matches the previous run keep their
+    previous entry as-is; only the others are classified (and aggregated).
+    A group whose source changed but whose output did not (same content
+    hash) is still reported as unchanged.
+    
+    Returns the groups, a manifest of added/changed/removed/unchanged group
+    names, and aggregation stats for the reconverted groups.
+    """
+    # Type is irrelevant here, but must not be None (that marks a header)
+    sources = group_records(iter_all_inputs(classify=lambda value: ""))
+    
+    groups = {}
+    stats = {}
+    manifest = {"added": [], "changed": [], "removed": [], "unchanged": []}
+    
+    for group_name, source in sources.items():
+        values = [obj["value"] for obj in source["objects"]]
+        source_hash = group_source_hash(values, aggregate)
+        previous = previous_groups.get(group_name)
+        if previous is not None and previous.get("source_hash") == source_hash:
+            groups[group_name] = previous
+            manifest["unchanged"].append(group_name)
+            continue
+        
+        objects = [{"type": t, "value": v} for t, v in zip(detect_types(values), values)]
+        if aggregate:
+            aggregated = aggregate_group_networks(objects)
+            stats[group_name] = (len(objects), len(aggregated))
+            objects = aggregated
+        group_hash = group_content_hash(objects)
+        groups[group_name] = {"objects": objects, "hash": group_hash, "source_hash": source_hash}
+        
+        if previous is None:
+            manifest["added"].append(group_name)
+        elif previous.get("hash") == group_hash:
+            manifest["unchanged"].append(group_name)
+        else:
+            manifest["changed"].append(group_name)
+    
+    manifest["removed"] = [name for name in previous_groups if name not in groups]
+    return groups, manifest, stats
+
+def load_changes_manifest(changes_file):
+    """
+    Load a changes manifest the updater has not acknowledged yet.
+    Returns an empty dict if there is none.
+    """
+    try:
+        with open(changes_file, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def merge_pending_changes(manifest, pending):
+    """
+    Carry over the changes of a manifest that has not been uploaded yet.
+    The updater deletes the manifest after a successful upload, so if one
+    is still there, converting again must not drop its changes.
+    """
+    current = manifest["added"] + manifest["changed"] + manifest["unchanged"]
+    added = set(manifest["added"]) | set(pending.get("added", []))
+    changed = set(manifest["changed"]) | set(pending.get("changed", []))
+    removed = manifest["removed"] + [
+        name for name in pending.get("removed", [])
+        if name not in current and name not in manifest["removed"]
+    ]
+    return {
+        "added": [name for name in current if name in added],
+        "changed": [name for name in current if name in changed and name not in added],
+        "removed": removed,
+        "unchanged": [name for name in current if name not in added and name not in changed]
+    }
+
+def write_changes_manifest(manifest, changes_file):
+    """
+    Write the changed-groups manifest used to limit downstream uploads.
+    """
+    with open(changes_file, 'w') as f:
+        json.dump(manifest, f, indent=4)
+
 def generate_json(groups, output_file):
     """
     Generate JSON file from parsed groups.
@@ -104,6 +649,28 @@ def generate_json(groups, output_file):
     
     return output
 
+def display_stream_summary(counts):
+    """
+    Display a summary of a streamed conversion.
+    """
+    print("\n" + "=" * 70)
+    print("Policy Object Groups Summary")
+    print("=" * 70)
+    
+    total_objects = 0
+    for group_name, type_counts in counts.items():
+        object_count = sum(type_counts.values())
+        total_objects += object_count
+        print(f"\n✓ {group_name}")
+        print(f"  Total objects: {object_count}")
+        for obj_type, count in type_counts.items():
+            print(f"    - {obj_type}: {count}")
+    
+    print("\n" + "=" * 70)
+    print(f"Total Groups: {len(counts)}")
+    print(f"Total Objects: {total_objects}")
+    print("=" * 70)
+
 def display_summary(groups):
     """
     Display a summary of what was parsed.
@@ -140,36 +707,83 @@ def display_summary(groups):
     print(f"Total Objects: {total_objects}")
     print("=" * 70)
 
-if __name__ == "__main__":
+def main():
+    """
+    Convert INPUT_FILE (and EXTRA_INPUTS) as configured above.
+    """
     print("=" * 70)
     print("Policy Object Text to JSON Converter")
     print("=" * 70)
     
+    output_file = OUTPUT_FILE or f"policy_objects.{OUTPUT_FORMAT}"
+    
     try:
-        # Parse the text file
         print(f"\nReading from: {INPUT_FILE}")
-        groups = parse_text_file(INPUT_FILE)
+        for filename, input_format in EXTRA_INPUTS:
+            print(f"Reading from: {filename} ({input_format})")
         
-        if not groups:
-            print("\n✗ No policy object groups found in the file.")
-            print("\nExpected format:")
-            print("  GroupName1")
-            print("  192.168.1.1")
-            print("  10.0.0.0/8")
-            print("  *.example.com")
-            print("  ")
-            print("  GroupName2")
-            print("  value1")
-            print("  value2")
+        # Streaming mode writes records as they are parsed
+        if OUTPUT_FORMAT == "ndjson":
+            if AGGREGATE_CIDRS or INCREMENTAL:
+                print("Note: AGGREGATE_CIDRS and INCREMENTAL are not applied in ndjson (streaming) mode")
+            counts = generate_ndjson(iter_all_inputs(), output_file)
+            display_stream_summary(counts)
+            print(f"\n✓ NDJSON file created: {output_file}")
+            print("\nThis file is ready to use with your policy object updater script!")
         else:
-            # Generate JSON
-            generate_json(groups, OUTPUT_FILE)
-            
-            # Display summary
-            display_summary(groups)
+            manifest = None
+            stats = None
+            if INCREMENTAL:
+                # Only groups whose source changed since the last run are converted
+                groups, manifest, stats = convert_incremental(load_previous_groups(output_file), AGGREGATE_CIDRS)
+            else:
+                # Parse the input (in parallel for a single large text file)
+                single_text_input = not EXTRA_INPUTS and (
+                    INPUT_FORMAT == "text" or (INPUT_FORMAT == "auto" and detect_input_format(INPUT_FILE) == "text")
+                )
+                if single_text_input and WORKERS != 1 and os.path.getsize(INPUT_FILE) >= MIN_PARALLEL_SIZE:
+                    groups = parse_text_file_parallel(INPUT_FILE, WORKERS or None)
+                else:
+                    groups = group_records(iter_all_inputs())
+                
+                # Optionally collapse networks before writing
+                if AGGREGATE_CIDRS:
+                    groups, stats = aggregate_networks(groups)
             
-            print(f"\n✓ JSON file created: {OUTPUT_FILE}")
-            print("\nThis file is ready to use with your policy object updater script!")
+            if not groups:
+                print("\n✗ No policy object groups found in the file.")
+                print("\nExpected format:")
+                print("  GroupName1")
+                print("  192.168.1.1")
+                print("  10.0.0.0/8")
+                print("  *.example.com")
+                print("  ")
+                print("  GroupName2")
+                print("  value1")
+                print("  value2")
+            else:
+                if stats:
+                    display_aggregation_summary(stats)
+                
+                # Report changes since the last upload (including any not uploaded yet)
+                if manifest is not None:
+                    manifest = merge_pending_changes(manifest, load_changes_manifest(CHANGES_FILE))
+                    write_changes_manifest(manifest, CHANGES_FILE)
+                    print(f"\nIncremental: {len(manifest['added'])} added, {len(manifest['changed'])} changed, "
+                          f"{len(manifest['removed'])} removed, {len(manifest['unchanged'])} unchanged groups")
+                    print(f"✓ Changes manifest written: {CHANGES_FILE}")
+                
+                if manifest is not None and not (manifest["added"] or manifest["changed"] or manifest["removed"]):
+                    print(f"\n⊙ No groups changed, {output_file} left as-is")
+                else:
+                    # Generate JSON
+                    generate_json(groups, output_file)
+                    
+                    # Display summary
+                    display_summary(groups)
+                    
+                    print(f"\n✓ JSON file created: {output_file}")
+                    print("\nThis file is ready to use with your policy object updater script!")
     
     except FileNotFoundError:
         print(f"\n✗ Error: File '{INPUT_FILE}' not found.")
@@ -183,4 +797,7 @@ if __name__ == "__main__":
         print("  value1")
         print("  value2")
     except Exception as e:
-        print(f"\n✗ Error: {e}")
\ No newline at end of file
+        print(f"\n✗ Error: {e}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file